@@ -6,92 +6,595 @@ redundant API calls when the same video appears in multiple playlists.
 """
 
 import json
+import os
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# zlib streams written by _encode() start with this byte; JSON starts with '{'
+_ZLIB_HEADER = 0x78
+_ZLIB_LEVEL = 6
+
+
+def _encode(data: dict) -> bytes:
+    """Serialize metadata to zlib-compressed UTF-8 JSON bytes for BLOB storage."""
+    if orjson is not None:
+        raw = orjson.dumps(data)
+    else:
+        raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return zlib.compress(raw, _ZLIB_LEVEL)
+
+
+def _inflate(content: Any) -> Any:
+    """Return stored content as JSON text/bytes, decompressing if needed."""
+    if isinstance(content, bytes) and content[:1] == bytes((_ZLIB_HEADER,)):
+        return zlib.decompress(content)
+    return content
+
+
+def _decode(content: Any) -> dict:
+    """Deserialize stored metadata (compressed or plain BLOB, or legacy JSON TEXT)."""
+    content = _inflate(content)
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _sql_inflate(content: Any) -> Optional[str]:
+    """SQL function inflate(content): stored content as JSON text for json_extract()."""
+    if content is None:
+        return None
+    content = _inflate(content)
+    if isinstance(content, bytes):
+        return content.decode('utf-8')
+    return content
+
+
+def _format_timestamp(value: Optional[int]) -> Optional[str]:
+    """Format a stored UNIX epoch timestamp as an ISO 8601 UTC string."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+# Decoded entries kept in memory per table (see Cache._lru_get)
+_LRU_SIZE = 4096
+
+# Upper bound on read-only connections opened for concurrent readers
+_READ_POOL_SIZE = os.cpu_count() or 4
+
+# IDs bound per "WHERE id IN (...)" query; stays under SQLite's historic
+# 999-variable limit
+_BULK_QUERY_SIZE = 500
+
+# Memory-map up to 1 GiB of the database file so reads of a warm cache are
+# served from the OS page cache without a pread() per page. Each pooled
+# connection maps the same file, so the pages are shared between them.
+_MMAP_SIZE = 1 << 30
+
+# Bump when the table layout changes; _init_tables() migrates older files
+_SCHEMA_VERSION = 3
+
+# How long a "video not found" answer is trusted before the API is asked again
+_NOT_FOUND_TTL = 30 * 24 * 60 * 60
+
+# Pure key -> blob stores: WITHOUT ROWID makes the primary key the table's
+# clustered B-tree instead of a separate index over a rowid table.
+_SQL_CREATE_VIDEOS = """
+    CREATE TABLE IF NOT EXISTS videos (
+        id TEXT PRIMARY KEY,
+        timestamp INTEGER NOT NULL,
+        content BLOB NOT NULL
+    ) WITHOUT ROWID
+"""
+_SQL_CREATE_CHANNELS = """
+    CREATE TABLE IF NOT EXISTS channels (
+        id TEXT PRIMARY KEY,
+        timestamp INTEGER NOT NULL,
+        content BLOB NOT NULL
+    ) WITHOUT ROWID
+"""
+_SQL_INDEX_VIDEOS = "CREATE INDEX IF NOT EXISTS idx_videos_timestamp ON videos(timestamp)"
+_SQL_INDEX_CHANNELS = "CREATE INDEX IF NOT EXISTS idx_channels_timestamp ON channels(timestamp)"
+
+# Tombstones for videos the API reported as missing (deleted or private)
+_SQL_CREATE_NOT_FOUND = """
+    CREATE TABLE IF NOT EXISTS videos_not_found (
+        id TEXT PRIMARY KEY,
+        timestamp INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+_SQL_PUT_NOT_FOUND = (
+    "INSERT INTO videos_not_found (id, timestamp) "
+    "VALUES (?, CAST(strftime('%s', 'now') AS INTEGER)) "
+    "ON CONFLICT(id) DO UPDATE SET timestamp = excluded.timestamp"
+)
+_SQL_CLEAR_NOT_FOUND = "DELETE FROM videos_not_found"
+
+
+class _Store:
+    """
+    One key -> metadata table of the cache, with its own in-memory LRU.
+    
+    Videos and channels share the same layout, so the row operations are
+    implemented once here; Cache owns the connections and locks and exposes
+    the per-kind methods as thin wrappers.
+    """
+    
+    def __init__(self, cache: "Cache", table: str):
+        """
+        Args:
+            cache: Owning cache (provides connections and locking)
+            table: Table name ('videos' or 'channels')
+        """
+        self._cache = cache
+        self.table = table
+        
+        # Upsert updates an existing row in place; INSERT OR REPLACE would
+        # delete and re-insert it
+        # The timestamp is taken by SQLite itself ('now' in epoch seconds)
+        self._sql_put = (
+            f"INSERT INTO {table} (id, timestamp, content) "
+            "VALUES (?, CAST(strftime('%s', 'now') AS INTEGER), ?) "
+            "ON CONFLICT(id) DO UPDATE SET timestamp = excluded.timestamp, content = excluded.content"
+        )
+        self._sql_get = f"SELECT content FROM {table} WHERE id = ?"
+        self._sql_get_field = (
+            "SELECT json_extract(inflate(content), ?), json_type(inflate(content), ?) "
+            f"FROM {table} WHERE id = ?"
+        )
+        self._sql_delete = f"DELETE FROM {table} WHERE id = ? RETURNING 1"
+        self._sql_clear = f"DELETE FROM {table}"
+        self._sql_count = f"SELECT COUNT(*) FROM {table}"
+        # Separate scalar subqueries let SQLite answer MIN/MAX with a single
+        # seek on idx_*_timestamp and COUNT(*) with its B-tree count; in one
+        # combined SELECT all three force a scan of the whole index
+        self._sql_stats = (
+            f"SELECT (SELECT COUNT(*) FROM {table}), "
+            f"(SELECT MIN(timestamp) FROM {table}), "
+            f"(SELECT MAX(timestamp) FROM {table})"
+        )
+        
+        self._lru_lock = threading.Lock()
+        self._lru: OrderedDict[str, dict] = OrderedDict()
+    
+    def _lru_get(self, key: str) -> Optional[dict]:
+        """Return a decoded entry from the in-memory LRU, marking it recently used."""
+        with self._lru_lock:
+            data = self._lru.get(key)
+            if data is not None:
+                self._lru.move_to_end(key)
+            return data
+    
+    def _lru_put(self, key: str, data: dict) -> None:
+        """Add a decoded entry to the in-memory LRU, evicting the oldest if full."""
+        with self._lru_lock:
+            self._lru[key] = data
+            self._lru.move_to_end(key)
+            if len(self._lru) > _LRU_SIZE:
+                self._lru.popitem(last=False)
+    
+    def clear_lru(self) -> None:
+        """Drop every in-memory entry, e.g. after a rollback."""
+        with self._lru_lock:
+            self._lru.clear()
+    
+    def put(self, key: str, data: dict) -> None:
+        """
+        Store metadata under key.
+        
+        The dict is also kept in the in-memory LRU, so a following get()
+        returns it without a decode; do not mutate it after storing.
+        """
+        self._cache._write(self._sql_put, (key, _encode(data)))
+        self._lru_put(key, data)
+    
+    def put_many(self, items: Iterable[tuple[str, dict]]) -> None:
+        """Store many (key, data) pairs in a single transaction."""
+        items = list(items)
+        rows = [(key, _encode(data)) for key, data in items]
+        
+        with self._cache.transaction():
+            self._cache.conn.executemany(self._sql_put, rows)
+        for key, data in items:
+            self._lru_put(key, data)
+    
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return stored metadata or None.
+        
+        Recently read entries are served from the in-memory LRU without
+        touching SQLite; callers must treat the returned dict as read-only.
+        """
+        data = self._lru_get(key)
+        if data is not None:
+            return data
+        
+        with self._cache._reader() as conn:
+            row = conn.execute(self._sql_get, (key,)).fetchone()
+        
+        if row is None:
+            return None
+        (content,) = row
+        data = _decode(content)
+        self._lru_put(key, data)
+        return data
+    
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict]:
+        """
+        Return stored metadata for many keys; missing keys are left out.
+        
+        Keys not in the LRU are read with one IN (...) query per
+        _BULK_QUERY_SIZE keys instead of one query each.
+        """
+        found: dict[str, dict] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            data = self._lru_get(key)
+            if data is not None:
+                found[key] = data
+            else:
+                missing.append(key)
+        
+        with self._cache._reader() as conn:
+            for start in range(0, len(missing), _BULK_QUERY_SIZE):
+                chunk = missing[start:start + _BULK_QUERY_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT id, content FROM {self.table} WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for key, content in rows:
+                    data = _decode(content)
+                    self._lru_put(key, data)
+                    found[key] = data
+        return found
+    
+    def get_field(self, key: str, field: str) -> Any:
+        """
+        Return one top-level field of stored metadata, or None.
+        
+        On an LRU miss the value is extracted by SQLite's json_extract(), so
+        the whole payload is not decoded in Python or added to the LRU.
+        """
+        data = self._lru_get(key)
+        if data is not None:
+            return data.get(field)
+        
+        path = f'$."{field}"'
+        with self._cache._reader() as conn:
+            row = conn.execute(self._sql_get_field, (path, path, key)).fetchone()
+        
+        if row is None:
+            return None
+        value, value_type = row
+        if value_type in ('object', 'array'):
+            return _decode(value)
+        if value_type in ('true', 'false'):
+            return bool(value)
+        return value
+    
+    def remove(self, key: str) -> bool:
+        """Delete key; returns True if a row was removed."""
+        with self._lru_lock:
+            self._lru.pop(key, None)
+        # RETURNING rows must be drained before the statement completes
+        with self._cache._write_lock:
+            deleted = self._cache.conn.execute(self._sql_delete, (key,)).fetchall()
+        return bool(deleted)
+    
+    def clear(self) -> None:
+        """Delete every row and in-memory entry."""
+        self._cache._write(self._sql_clear)
+        self.clear_lru()
+    
+    def count(self) -> int:
+        """Return the number of stored rows."""
+        with self._cache._reader() as conn:
+            (count,) = conn.execute(self._sql_count).fetchone()
+        return count
+    
+    def stats(self) -> dict:
+        """Return row count and oldest/newest timestamps in a single query."""
+        with self._cache._reader() as conn:
+            count, oldest, newest = conn.execute(self._sql_stats).fetchone()
+        return {
+            'count': count,
+            'oldest': _format_timestamp(oldest),
+            'newest': _format_timestamp(newest),
+        }
 
 
 class Cache:
-    """SQLite-based cache for YouTube metadata."""
+    """
+    SQLite-based cache for YouTube metadata.
+    
+    Safe to share between threads: writes go through a single connection
+    guarded by a lock, while reads check out read-only connections from a
+    small pool so they can run alongside the writer under WAL.
+    """
     
     def __init__(self, db_path: Optional[Path] = None):
         """
-        Initialize cache connection.
+        Initialize cache.
+        
+        The database is opened lazily on first use, so creating a Cache that
+        is never queried costs no file system or SQLite work.
         
         Args:
             db_path: Path to SQLite database. Defaults to ~/.youtube-helper/cache.sqlite3
         """
+        self._create_dir = db_path is None
         if db_path is None:
-            cache_dir = Path.home() / ".youtube-helper"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            db_path = cache_dir / "cache.sqlite3"
+            db_path = Path.home() / ".youtube-helper" / "cache.sqlite3"
         
         self.db_path = db_path
-        self.conn = sqlite3.connect(str(db_path))
-        self.conn.row_factory = sqlite3.Row
-        self._init_tables()
-    
-    def _init_tables(self):
-        """Create cache tables if they don't exist."""
-        cursor = self.conn.cursor()
-        
-        # Videos table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS videos (
-                id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                content TEXT NOT NULL
-            )
-        """)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._in_transaction = False
+        self._transaction_owner: Optional[int] = None
+        self._read_pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._read_conns: list[sqlite3.Connection] = []
+        self._read_pool_lock = threading.Lock()
+        self.videos = _Store(self, 'videos')
+        self.channels = _Store(self, 'channels')
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Write connection, opened and initialized on first access."""
+        if self._conn is None:
+            with self._write_lock:
+                if self._conn is None:
+                    self._conn = self._connect()
+        return self._conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the write connection, tune it and make sure the schema is current.
+        
+        Returns:
+            Ready-to-use write connection
+        """
+        if self._create_dir:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # Autocommit mode: transaction() issues BEGIN/COMMIT explicitly
+        conn = sqlite3.connect(
+            str(self.db_path),
+            isolation_level=None,
+            cached_statements=256,
+            check_same_thread=False,
+        )
+        conn.create_function("inflate", 1, _sql_inflate, deterministic=True)
+        self._init_new_database(conn)
+        conn.execute("PRAGMA journal_mode=WAL")
+        self._apply_pragmas(conn)
+        self._init_tables(conn)
+        return conn
+    
+    @staticmethod
+    def _init_new_database(conn: sqlite3.Connection):
+        """
+        Set file-level layout options on a database that has no schema yet.
+        
+        page_size and auto_vacuum only take effect before the first table is
+        created (and page_size cannot change once in WAL mode), so this runs
+        before journal_mode=WAL. Existing files keep their layout.
+        """
+        if conn.execute("PRAGMA schema_version").fetchone()[0] != 0:
+            return
+        
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection):
+        """
+        Tune a connection for a write-heavy metadata cache.
+        
+        journal_mode=WAL persists in the database file and is set once on the
+        write connection; these settings are per-connection and must be
+        applied on every open.
+        """
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+    
+    @classmethod
+    def _init_tables(cls, conn: sqlite3.Connection):
+        """
+        Create cache tables if they don't exist, migrating older layouts.
+        
+        The schema version is tracked in PRAGMA user_version. Databases created
+        before content moved to BLOB keep TEXT-typed content values; SQLite
+        stores the bytes as-is and _decode() reads both.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        conn.execute("BEGIN")
+        try:
+            if version < 2:
+                # v1: WITHOUT ROWID tables; v2: INTEGER epoch timestamps
+                cls._rebuild_table(conn, 'videos', _SQL_CREATE_VIDEOS)
+                cls._rebuild_table(conn, 'channels', _SQL_CREATE_CHANNELS)
+            
+            conn.execute(_SQL_CREATE_VIDEOS)
+            conn.execute(_SQL_CREATE_CHANNELS)
+            conn.execute(_SQL_INDEX_VIDEOS)
+            conn.execute(_SQL_INDEX_CHANNELS)
+            # v3: videos_not_found tombstones
+            conn.execute(_SQL_CREATE_NOT_FOUND)
+            
+            if version != _SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @staticmethod
+    def _rebuild_table(conn: sqlite3.Connection, table: str, create_sql: str) -> None:
+        """
+        Copy an existing table into a freshly created one with the current layout.
+        
+        ISO 8601 timestamps written by older versions are converted to UNIX
+        epoch seconds. Does nothing if the table does not exist yet (new
+        database).
+        
+        Args:
+            conn: Write connection inside an open transaction
+            table: Table name ('videos' or 'channels')
+            create_sql: CREATE TABLE statement for the current layout
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if not exists:
+            return
         
-        # Channels table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS channels (
-                id TEXT PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                content TEXT NOT NULL
-            )
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        conn.execute(create_sql)
+        conn.execute(f"""
+            INSERT INTO {table} (id, timestamp, content)
+            SELECT
+                id,
+                CASE WHEN typeof(timestamp) = 'text'
+                    THEN CAST(strftime('%s', timestamp) AS INTEGER)
+                    ELSE timestamp
+                END,
+                content
+            FROM {table}_old
         """)
+        conn.execute(f"DROP TABLE {table}_old")
+    
+    def _open_read_conn(self) -> sqlite3.Connection:
+        """Open a read-only connection to the cache database."""
+        self.conn  # the file and tables must exist before a read-only open
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            isolation_level=None,
+            cached_statements=256,
+            check_same_thread=False,
+        )
+        conn.create_function("inflate", 1, _sql_inflate, deterministic=True)
+        self._apply_pragmas(conn)
+        return conn
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for reading.
+        
+        Inside this thread's own transaction() the write connection is used so
+        uncommitted writes stay visible; otherwise a pooled read-only
+        connection is borrowed, opening a new one while the pool is below
+        _READ_POOL_SIZE.
+        
+        Yields:
+            Connection to run SELECT statements on
+        """
+        if self._transaction_owner == threading.get_ident():
+            yield self.conn
+            return
+        
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                if len(self._read_conns) < _READ_POOL_SIZE:
+                    conn = self._open_read_conn()
+                    self._read_conns.append(conn)
+                else:
+                    conn = None
+            if conn is None:
+                conn = self._read_pool.get()
+        
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+    
+    def _write(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """
+        Execute a write statement on the single write connection.
+        
+        The connection runs in autocommit mode, so the statement commits
+        immediately unless an outer transaction() is active, in which case
+        the commit is left to the transaction boundary.
         
-        self.conn.commit()
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+            
+        Returns:
+            Cursor used to execute the statement
+        """
+        with self._write_lock:
+            return self.conn.execute(sql, params)
     
     def put_video(self, video_id: str, data: dict) -> None:
         """
         Store video metadata in cache.
         
+        The dict is also kept in the in-memory LRU, so a following get_video()
+        returns it without a decode; do not mutate it after storing.
+        
         Args:
             video_id: YouTube video ID
             data: Video metadata as dictionary
         """
-        cursor = self.conn.cursor()
-        timestamp = datetime.utcnow().isoformat()
-        content = json.dumps(data)
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO videos (id, timestamp, content)
-            VALUES (?, ?, ?)
-        """, (video_id, timestamp, content))
+        self.videos.put(video_id, data)
+    
+    def put_videos(self, items: Iterable[tuple[str, dict]]) -> None:
+        """
+        Store metadata for many videos in a single transaction.
         
-        self.conn.commit()
+        Args:
+            items: Iterable of (video_id, data) pairs
+        """
+        self.videos.put_many(items)
     
     def get_video(self, video_id: str) -> Optional[dict]:
         """
         Retrieve video metadata from cache.
         
+        Recently read entries are served from an in-memory LRU without
+        touching SQLite; callers must treat the returned dict as read-only.
+        
         Args:
             video_id: YouTube video ID
             
         Returns:
             Video metadata dictionary or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT content FROM videos WHERE id = ?", (video_id,))
-        row = cursor.fetchone()
+        return self.videos.get(video_id)
+    
+    def get_videos(self, video_ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Retrieve metadata for many videos at once.
         
-        if row:
-            return json.loads(row['content'])
-        return None
+        Args:
+            video_ids: YouTube video IDs
+            
+        Returns:
+            Dict of video_id -> metadata for the IDs found in cache
+        """
+        return self.videos.get_many(video_ids)
     
     def remove_video(self, video_id: str) -> bool:
         """
@@ -103,47 +606,74 @@ class Cache:
         Returns:
             True if video was removed, False if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM videos WHERE id = ?", (video_id,))
-        self.conn.commit()
-        return cursor.rowcount > 0
+        return self.videos.remove(video_id)
     
     def put_channel(self, channel_id: str, data: dict) -> None:
         """
         Store channel metadata in cache.
         
+        The dict is also kept in the in-memory LRU, so a following
+        get_channel() returns it without a decode; do not mutate it after
+        storing.
+        
         Args:
             channel_id: YouTube channel ID
             data: Channel metadata as dictionary
         """
-        cursor = self.conn.cursor()
-        timestamp = datetime.utcnow().isoformat()
-        content = json.dumps(data)
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO channels (id, timestamp, content)
-            VALUES (?, ?, ?)
-        """, (channel_id, timestamp, content))
+        self.channels.put(channel_id, data)
+    
+    def put_channels(self, items: Iterable[tuple[str, dict]]) -> None:
+        """
+        Store metadata for many channels in a single transaction.
         
-        self.conn.commit()
+        Args:
+            items: Iterable of (channel_id, data) pairs
+        """
+        self.channels.put_many(items)
     
     def get_channel(self, channel_id: str) -> Optional[dict]:
         """
         Retrieve channel metadata from cache.
         
+        Recently read entries are served from an in-memory LRU without
+        touching SQLite; callers must treat the returned dict as read-only.
+        
         Args:
             channel_id: YouTube channel ID
             
         Returns:
             Channel metadata dictionary or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT content FROM channels WHERE id = ?", (channel_id,))
-        row = cursor.fetchone()
+        return self.channels.get(channel_id)
+    
+    def get_channels(self, channel_ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Retrieve metadata for many channels at once.
         
-        if row:
-            return json.loads(row['content'])
-        return None
+        Args:
+            channel_ids: YouTube channel IDs
+            
+        Returns:
+            Dict of channel_id -> metadata for the IDs found in cache
+        """
+        return self.channels.get_many(channel_ids)
+    
+    def get_channel_field(self, channel_id: str, key: str) -> Any:
+        """
+        Retrieve a single top-level field of cached channel metadata.
+        
+        On an LRU miss the value is extracted by SQLite's json_extract(), so
+        reading e.g. the title does not decode the whole payload in Python
+        or populate the LRU.
+        
+        Args:
+            channel_id: YouTube channel ID
+            key: Top-level key in the channel metadata (e.g. 'title')
+            
+        Returns:
+            Field value, or None if the channel or the field is not cached
+        """
+        return self.channels.get_field(channel_id, key)
     
     def remove_channel(self, channel_id: str) -> bool:
         """
@@ -155,29 +685,59 @@ class Cache:
         Returns:
             True if channel was removed, False if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM channels WHERE id = ?", (channel_id,))
-        self.conn.commit()
-        return cursor.rowcount > 0
+        return self.channels.remove(channel_id)
+    
+    def put_videos_not_found(self, video_ids: Iterable[str]) -> None:
+        """
+        Remember that the API reported these videos as not found.
+        
+        Args:
+            video_ids: YouTube video IDs
+        """
+        rows = [(video_id,) for video_id in video_ids]
+        with self.transaction():
+            self.conn.executemany(_SQL_PUT_NOT_FOUND, rows)
+    
+    def get_videos_not_found(self, video_ids: Iterable[str], max_age: int = _NOT_FOUND_TTL) -> set[str]:
+        """
+        Return which of the given videos were recently reported as not found.
+        
+        Args:
+            video_ids: YouTube video IDs
+            max_age: Ignore tombstones older than this many seconds
+            
+        Returns:
+            Set of video IDs with a tombstone younger than max_age
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        found: set[str] = set()
+        with self._reader() as conn:
+            for start in range(0, len(video_ids), _BULK_QUERY_SIZE):
+                chunk = video_ids[start:start + _BULK_QUERY_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT id FROM videos_not_found WHERE id IN ({placeholders}) "
+                    "AND timestamp >= CAST(strftime('%s', 'now') AS INTEGER) - ?",
+                    (*chunk, max_age),
+                ).fetchall()
+                found.update(video_id for (video_id,) in rows)
+        return found
     
     def clear(self, table: Optional[str] = None) -> None:
         """
         Clear cache data.
         
+        Clearing videos also drops "not found" tombstones.
+        
         Args:
             table: 'videos', 'channels', or None to clear both
         """
-        cursor = self.conn.cursor()
-        
-        if table == 'videos':
-            cursor.execute("DELETE FROM videos")
-        elif table == 'channels':
-            cursor.execute("DELETE FROM channels")
-        else:
-            cursor.execute("DELETE FROM videos")
-            cursor.execute("DELETE FROM channels")
-        
-        self.conn.commit()
+        with self.transaction():
+            if table in ('videos', None):
+                self.videos.clear()
+                self._write(_SQL_CLEAR_NOT_FOUND)
+            if table in ('channels', None):
+                self.channels.clear()
     
     def stats(self) -> dict:
         """
@@ -186,17 +746,9 @@ class Cache:
         Returns:
             Dictionary with video and channel counts
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) as count FROM videos")
-        video_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM channels")
-        channel_count = cursor.fetchone()['count']
-        
         return {
-            'videos': video_count,
-            'channels': channel_count,
+            'videos': self.videos.count(),
+            'channels': self.channels.count(),
             'db_path': str(self.db_path)
         }
     
@@ -207,45 +759,73 @@ class Cache:
         Returns:
             Dictionary with detailed statistics for videos and channels
         """
-        cursor = self.conn.cursor()
+        return {
+            'db_path': str(self.db_path),
+            'videos': self.videos.stats(),
+            'channels': self.channels.stats(),
+        }
+    
+    def vacuum(self, pages: int = 1000) -> None:
+        """
+        Return free pages to the filesystem without a full VACUUM.
         
-        # Video statistics
-        cursor.execute("SELECT COUNT(*) as count FROM videos")
-        video_count = cursor.fetchone()['count']
+        Only has an effect on databases created with auto_vacuum=INCREMENTAL.
+        Must not be called inside transaction().
         
-        cursor.execute("""
-            SELECT MIN(timestamp) as oldest, MAX(timestamp) as newest 
-            FROM videos
-        """)
-        video_times = cursor.fetchone()
-        
-        # Channel statistics
-        cursor.execute("SELECT COUNT(*) as count FROM channels")
-        channel_count = cursor.fetchone()['count']
+        Args:
+            pages: Maximum number of free pages to release (0 releases all)
+        """
+        with self._write_lock:
+            # incremental_vacuum frees one page per step; execute() would only
+            # step it once, executescript() runs it to completion
+            self.conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    
+    @contextmanager
+    def transaction(self) -> Iterator["Cache"]:
+        """
+        Group several writes into a single commit.
         
-        cursor.execute("""
-            SELECT MIN(timestamp) as oldest, MAX(timestamp) as newest 
-            FROM channels
-        """)
-        channel_times = cursor.fetchone()
+        Holds the write lock for the whole block, so other threads' writes
+        wait until it finishes. Commits on success and rolls back if the
+        block raises. Nested calls from the same thread join the outermost
+        transaction.
         
-        return {
-            'db_path': str(self.db_path),
-            'videos': {
-                'count': video_count,
-                'oldest': video_times['oldest'],
-                'newest': video_times['newest'],
-            },
-            'channels': {
-                'count': channel_count,
-                'oldest': channel_times['oldest'],
-                'newest': channel_times['newest'],
-            }
-        }
+        Yields:
+            This cache instance
+        """
+        with self._write_lock:
+            if self._in_transaction:
+                yield self
+                return
+            
+            self.conn.execute("BEGIN")
+            self._in_transaction = True
+            self._transaction_owner = threading.get_ident()
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                # Entries added by puts in this block no longer match the database
+                self.videos.clear_lru()
+                self.channels.clear_lru()
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            finally:
+                self._in_transaction = False
+                self._transaction_owner = None
     
     def close(self):
-        """Close database connection."""
-        self.conn.close()
+        """Close the write connection and every pooled read connection."""
+        with self._read_pool_lock:
+            for conn in self._read_conns:
+                conn.close()
+            self._read_conns.clear()
+        self._read_pool = queue.Queue()
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
     def __enter__(self):
         """Context manager entry."""
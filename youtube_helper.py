@@ -14,69 +14,287 @@ import logging
 import os
 import sqlite3
 import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
 import requests
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
 from cache import Cache
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # YouTube Data API v3 configuration
 YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
 YOUTUBE_API_KEY_ENV_VAR = "YOUTUBE_API_KEY"
 ERROR_LOG_PATH = Path.home() / "Library/Logs/youtube-helper/error.log"
 
+# Concurrent YouTube API requests while enriching a playlist
+FETCH_WORKERS = 16
+
+# API error reasons (errors[0].reason) meaning the video itself is gone
+_NOT_FOUND_REASONS = frozenset({'videoNotFound', 'videoNotAvailable'})
+
+# Abort a run after this many hard API failures within ABORT_WINDOW seconds
+ABORT_THRESHOLD = 10
+ABORT_WINDOW = 60.0
+
+# Statuses the HTTP session retries with backoff (throttling, server errors)
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Statuses that count toward aborting: those retrying will not fix (bad
+# request, bad key, quota exhausted), plus retryable ones still returned
+# after the session's retries were used up
+_HARD_FAILURE_STATUSES = frozenset({400, 401, 403}) | _RETRY_STATUSES
+
+# Template events joined per write when streaming rendered HTML to disk
+_RENDER_BUFFER_SIZE = 64
+
+# JSON text stored for empty list columns in SQLite exports
+_EMPTY_JSON_LIST = "[]"
+
+# Maximum IDs accepted by a single videos.list / channels.list call
+VIDEOS_PER_REQUEST = 50
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create a requests session for YouTube API calls.
+    
+    Keeps TLS connections to the API alive across calls, with a pool large
+    enough for FETCH_WORKERS concurrent requests, and retries transient
+    failures (429/5xx) with exponential backoff, honouring Retry-After.
+    After the last retry the final response is returned as-is so callers
+    can report its error.
+    
+    Returns:
+        Configured session
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=sorted(_RETRY_STATUSES),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=FETCH_WORKERS * 2, max_retries=retry)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by all fetchers (requests.Session is safe for concurrent GETs)
+_SESSION = create_http_session()
+
+
+def json_loads(data: bytes | str):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_compact(data) -> str:
+    """Serialize to single-line JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def read_json_file(path: Path):
+    """
+    Load a JSON file, using orjson when it is installed.
+    
+    The file is read as bytes in one call and parsed without an
+    intermediate str, which is what orjson expects.
+    
+    Args:
+        path: JSON file to read
+        
+    Returns:
+        Parsed JSON data
+        
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def write_json_file(path: Path, data, compact: bool = False) -> None:
+    """
+    Write data as UTF-8 JSON.
+    
+    Args:
+        path: Output file path
+        data: JSON-serializable object
+        compact: Write single-line JSON instead of 2-space indented output
+            (roughly half the bytes for large files)
+    """
+    if orjson is not None:
+        option = 0 if compact else orjson.OPT_INDENT_2
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+        return
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        if compact:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class ErrorLog:
+    """
+    Append-only writer for the error log, kept open for a whole run.
+    
+    The file is opened (and its directory created) on the first error only,
+    and writes go through a 64 KiB buffer that is flushed when the context
+    exits instead of after every line.
+    """
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: Log file path. Defaults to ERROR_LOG_PATH
+        """
+        self.path = path or ERROR_LOG_PATH
+        self._file = None
+        self._failed = False
+    
+    def write(self, video_id: str, error_msg: str, error_details: Optional[dict] = None, error_obj: Optional[Exception] = None) -> None:
+        """
+        Append a single error line.
+        
+        Args:
+            video_id: YouTube video ID
+            error_msg: Error message
+            error_details: Dict with status_code, error_code, message from API
+            error_obj: Exception object for additional details
+        """
+        if self._failed:
+            return
+        
+        timestamp = datetime.now(timezone.utc).isoformat()
+        line = f"[{timestamp}] Video ID: {video_id} | Error: {error_msg}"
+        
+        # Log error_details as single-line JSON if available
+        if error_details:
+            line += f" | Details: {json_dumps_compact(error_details)}"
+        
+        # Log exception type if available
+        if error_obj:
+            line += f" | Exception: {type(error_obj).__name__}"
+        
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', buffering=65536, encoding='utf-8')
+            self._file.write(line + "\n")
+        except Exception as e:
+            # Warn once and stop trying for the rest of the run
+            self._failed = True
+            print(f"Warning: Could not write to error log: {e}", file=sys.stderr)
+    
+    def close(self) -> None:
+        """Flush buffered lines and close the log file."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception as e:
+                print(f"Warning: Could not write to error log: {e}", file=sys.stderr)
+            self._file = None
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class AbortPolicy:
+    """
+    Decide when a run should stop calling the API.
+    
+    Transient failures are already retried by the shared session, so only
+    hard failures count: responses with a status in _HARD_FAILURE_STATUSES
+    (including 429/5xx that outlasted the retries) and requests that got no
+    response even after retrying. The run aborts once `threshold` of them
+    fall within a sliding `window` of seconds, so occasional blips are
+    tolerated but a sustained outage or throttling stops the run.
+    """
+    
+    def __init__(self, threshold: int = ABORT_THRESHOLD, window: float = ABORT_WINDOW):
+        """
+        Args:
+            threshold: Hard failures that trigger an abort
+            window: Sliding window length in seconds
+        """
+        self.threshold = threshold
+        self.window = window
+        self._failures: deque[float] = deque()
+    
+    def record_failure(self, status_code: Optional[int] = None) -> None:
+        """
+        Record a failed API call; soft failures are ignored.
+        
+        Args:
+            status_code: HTTP status of the failed call, or None if no
+                response was received
+        """
+        if status_code is None or status_code in _HARD_FAILURE_STATUSES:
+            self._failures.append(time.monotonic())
+    
+    def should_abort(self) -> bool:
+        """Return True once `threshold` hard failures fall within the window."""
+        if len(self._failures) < self.threshold:
+            return False
+        cutoff = time.monotonic() - self.window
+        while self._failures and self._failures[0] < cutoff:
+            self._failures.popleft()
+        return len(self._failures) >= self.threshold
+    
+    def describe(self) -> str:
+        """Short explanation used in abort messages."""
+        return f"{self.threshold} API call errors within {self.window:.0f}s"
+
+
+def _response_status(error: requests.RequestException) -> Optional[int]:
+    """Return the HTTP status attached to a requests exception, if any."""
+    return error.response.status_code if error.response is not None else None
+
 
 def write_error_to_log(video_id: str, error_msg: str, error_details: Optional[dict] = None, error_obj: Optional[Exception] = None) -> None:
     """
     Write a single error to error log file immediately.
     
+    Loops that may log many errors should keep one ErrorLog open instead.
+    
     Args:
         video_id: YouTube video ID
         error_msg: Error message
         error_details: Dict with status_code, error_code, message from API
         error_obj: Exception object for additional details
     """
-    try:
-        # Create directory if needed
-        ERROR_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        
-        timestamp = datetime.now(timezone.utc).isoformat()
-        
-        with open(ERROR_LOG_PATH, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] Video ID: {video_id} | Error: {error_msg}")
-            
-            # Log error_details as single-line JSON if available
-            if error_details:
-                f.write(f" | Details: {json.dumps(error_details, separators=(',', ':'))}")
-            
-            # Log exception type if available
-            if error_obj:
-                f.write(f" | Exception: {type(error_obj).__name__}")
-            
-            f.write("\n")
-            f.flush()
-    except Exception as e:
-        print(f"Warning: Could not write to error log: {e}", file=sys.stderr)
+    with ErrorLog() as error_log:
+        error_log.write(video_id, error_msg, error_details=error_details, error_obj=error_obj)
 
 
-def setup_argparse() -> argparse.ArgumentParser:
-    """Configure command-line argument parser."""
-    parser = argparse.ArgumentParser(
-        description="Manage and organize YouTube saved content from playlists.",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-    
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-    
-    # Process command (default)
-    process_parser = subparsers.add_parser(
-        "process",
-        help="Process YouTube playlist data",
-    )
+def _build_process_parser(process_parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the process command."""
     process_parser.add_argument(
         "-i", "--input",
         type=str,
@@ -94,12 +312,10 @@ def setup_argparse() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable verbose output",
     )
-    
-    # Cache command - manage cache
-    cache_parser = subparsers.add_parser(
-        "cache",
-        help="Manage cache",
-    )
+
+
+def _build_cache_parser(cache_parser: argparse.ArgumentParser) -> None:
+    """Add the cache subcommands (info, purge, inspect)."""
     cache_subparsers = cache_parser.add_subparsers(dest="cache_action", help="Cache actions")
     
     cache_subparsers.add_parser(
@@ -124,12 +340,10 @@ def setup_argparse() -> argparse.ArgumentParser:
     
     channel_inspect = inspect_subparsers.add_parser("channel", help="Inspect cached channel")
     channel_inspect.add_argument("channel_id", help="YouTube channel ID")
-    
-    # Enrich command - fetch metadata for Google Takeout playlist export
-    enrich_parser = subparsers.add_parser(
-        "enrich",
-        help="Enrich Google Takeout playlist CSV with YouTube metadata",
-    )
+
+
+def _build_enrich_parser(enrich_parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the enrich command (Takeout playlist CSV -> JSON)."""
     enrich_parser.add_argument(
         "-i", "--input",
         type=str,
@@ -158,12 +372,15 @@ def setup_argparse() -> argparse.ArgumentParser:
         dest="sqlite_output",
         help="Output SQLite database file with enriched data",
     )
-    
-    # Config command - manage API key and settings
-    config_parser = subparsers.add_parser(
-        "config",
-        help="Configure API keys and settings",
+    enrich_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write single-line JSON instead of indented output (smaller and faster for large playlists)",
     )
+
+
+def _build_config_parser(config_parser: argparse.ArgumentParser) -> None:
+    """Add the config subcommands for managing the API key."""
     config_subparsers = config_parser.add_subparsers(dest="config_action", help="Config actions")
     
     config_set_parser = config_subparsers.add_parser(
@@ -185,12 +402,10 @@ def setup_argparse() -> argparse.ArgumentParser:
         "clear-api-key",
         help="Remove stored API key",
     )
-    
-    # Compare command - compare enriched output with original playlist
-    compare_parser = subparsers.add_parser(
-        "compare",
-        help="Compare enriched JSON output with original playlist CSV",
-    )
+
+
+def _build_compare_parser(compare_parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the compare command."""
     compare_parser.add_argument(
         "-p", "--playlist",
         type=str,
@@ -209,12 +424,10 @@ def setup_argparse() -> argparse.ArgumentParser:
         required=True,
         help="Output JSON file for comparison report",
     )
-    
-    # Enrich-video command - enrich a single video by ID
-    enrich_video_parser = subparsers.add_parser(
-        "enrich-video",
-        help="Enrich a single video by ID",
-    )
+
+
+def _build_enrich_video_parser(enrich_video_parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the enrich-video command."""
     enrich_video_parser.add_argument(
         "video_id",
         type=str,
@@ -230,12 +443,10 @@ def setup_argparse() -> argparse.ArgumentParser:
         type=str,
         help="YouTube Data API key (or set YOUTUBE_API_KEY env var)",
     )
-    
-    # Debug command - debug raw API responses
-    debug_parser = subparsers.add_parser(
-        "debug",
-        help="Debug raw API responses",
-    )
+
+
+def _build_debug_parser(debug_parser: argparse.ArgumentParser) -> None:
+    """Add the debug subcommands for raw API responses."""
     debug_subparsers = debug_parser.add_subparsers(dest="debug_action", help="Debug actions")
     
     debug_video_parser = debug_subparsers.add_parser(
@@ -252,12 +463,10 @@ def setup_argparse() -> argparse.ArgumentParser:
         type=str,
         help="YouTube Data API key (or set YOUTUBE_API_KEY env var)",
     )
-    
-    # Render command - render enriched JSON to HTML
-    render_parser = subparsers.add_parser(
-        "render",
-        help="Render enriched JSON playlist data to HTML page",
-    )
+
+
+def _build_render_parser(render_parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the render command (enriched JSON -> HTML)."""
     render_parser.add_argument(
         "-i", "--input",
         type=str,
@@ -280,12 +489,10 @@ def setup_argparse() -> argparse.ArgumentParser:
         type=str,
         help="Custom Jinja2 template file (default: built-in playlist.html)",
     )
-    
-    # Export command - process entire Google Takeout playlist export
-    export_parser = subparsers.add_parser(
-        "export",
-        help="Process entire Google Takeout playlist export folder to HTML",
-    )
+
+
+def _build_export_parser(export_parser: argparse.ArgumentParser) -> None:
+    """Add arguments for the export command (Takeout folder -> HTML)."""
     export_parser.add_argument(
         "-i", "--input",
         type=str,
@@ -323,6 +530,53 @@ def setup_argparse() -> argparse.ArgumentParser:
         dest="sqlite_output",
         help="Output SQLite database file with enriched data",
     )
+
+
+# Subcommand name -> (help text, builder). Builders add the command's
+# arguments and are only run for the command being invoked.
+_COMMANDS = {
+    "process": ("Process YouTube playlist data", _build_process_parser),
+    "cache": ("Manage cache", _build_cache_parser),
+    "enrich": ("Enrich Google Takeout playlist CSV with YouTube metadata", _build_enrich_parser),
+    "config": ("Configure API keys and settings", _build_config_parser),
+    "compare": ("Compare enriched JSON output with original playlist CSV", _build_compare_parser),
+    "enrich-video": ("Enrich a single video by ID", _build_enrich_video_parser),
+    "debug": ("Debug raw API responses", _build_debug_parser),
+    "render": ("Render enriched JSON playlist data to HTML page", _build_render_parser),
+    "export": ("Process entire Google Takeout playlist export folder to HTML", _build_export_parser),
+}
+
+
+def setup_argparse(argv: Optional[list[str]] = None) -> argparse.ArgumentParser:
+    """Configure command-line argument parser.
+    
+    Every subcommand is registered so top-level help lists them all, but only
+    the one named in argv gets its arguments built; the rest stay empty stubs.
+    With no recognizable command (e.g. bare --help) all of them are built.
+    
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    
+    Returns:
+        Configured argument parser
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    selected = next((arg for arg in argv if not arg.startswith('-')), None)
+    if selected not in _COMMANDS:
+        selected = None
+    
+    parser = argparse.ArgumentParser(
+        description="Manage and organize YouTube saved content from playlists.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    
+    for name, (help_text, build) in _COMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if selected is None or selected == name:
+            build(command_parser)
     
     return parser
 
@@ -392,64 +646,173 @@ def parse_takeout_csv(input_path: Path) -> list[dict]:
     Returns:
         List of dicts with video_id and added_at
     """
-    videos = []
-    with open(input_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open(input_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            id_idx = header.index('Video ID')
+            added_idx = header.index('Playlist Video Creation Timestamp')
+        except ValueError as e:
+            raise ValueError(f"Unexpected CSV header in {input_path}: {e}") from None
+        
+        # Positional access avoids building a DictReader dict per row; IDs
+        # are stripped here once so callers can use them as keys directly
+        return [
+            {'video_id': row[id_idx].strip(), 'added_at': row[added_idx]}
+            for row in reader
+            if row
+        ]
+
+
+def iter_takeout_video_ids(input_path: Path):
+    """
+    Yield just the video IDs from a Google Takeout playlist CSV file.
+    
+    Lighter than parse_takeout_csv for callers that only need the IDs: no
+    per-row dict and no list of the whole file.
+    
+    Args:
+        input_path: Path to CSV file
+        
+    Yields:
+        Video IDs (stripped), in file order
+    """
+    with open(input_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            id_idx = header.index('Video ID')
+        except ValueError as e:
+            raise ValueError(f"Unexpected CSV header in {input_path}: {e}") from None
+        
         for row in reader:
-            videos.append({
-                'video_id': row['Video ID'],
-                'added_at': row['Playlist Video Creation Timestamp'],
-            })
-    return videos
+            if row:
+                yield row[id_idx].strip()
 
 
-def fetch_video_metadata(video_id: str, api_key: str) -> tuple[Optional[dict], Optional[dict]]:
+def fetch_video_metadata(
+    video_id: str,
+    api_key: str,
+    session: Optional[requests.Session] = None,
+) -> tuple[Optional[dict], Optional[dict]]:
     """
     Fetch video metadata from YouTube Data API v3.
     
     Args:
         video_id: YouTube video ID
         api_key: YouTube Data API key
+        session: HTTP session to use. Defaults to the shared module session
         
     Returns:
         Tuple of (video metadata dict or None, error details dict or None)
     """
+    return fetch_videos_metadata([video_id], api_key, session)[video_id]
+
+
+def fetch_videos_metadata(
+    video_ids: list[str],
+    api_key: str,
+    session: Optional[requests.Session] = None,
+) -> dict[str, tuple[Optional[dict], Optional[dict]]]:
+    """
+    Fetch metadata for up to VIDEOS_PER_REQUEST videos in one API call.
+    
+    videos.list accepts a comma-separated ID list at the same quota cost as
+    a single ID.
+    
+    Args:
+        video_ids: YouTube video IDs (at most VIDEOS_PER_REQUEST)
+        api_key: YouTube Data API key
+        session: HTTP session to use. Defaults to the shared module session
+        
+    Returns:
+        Dict of video_id -> (video metadata dict or None, error details dict or None).
+        Metadata dicts are stamped with a shared '_extracted_at' time.
+        Request-level errors are reported for every ID; IDs missing from the
+        response get a 'Video not found' error. Error dicts carry the API's
+        'reason' code (errors[0].reason) when there is one.
+    """
     url = f"{YOUTUBE_API_BASE}/videos"
     params = {
         'part': 'snippet,statistics,topicDetails,status',
-        'id': video_id,
+        'id': ','.join(video_ids),
         'key': api_key,
     }
     
-    response = requests.get(url, params=params, timeout=10)
+    response = (session or _SESSION).get(url, params=params, timeout=10)
     status_code = response.status_code
     
     try:
-        data = response.json()
+        data = json_loads(response.content)
     except Exception:
         data = {}
     
     # Check for API errors in response body
     if 'error' in data:
         error_info = data['error']
-        return None, {
+        error_list = error_info.get('errors') or []
+        error = {
             'status_code': status_code,
             'error_code': error_info.get('code'),
+            'reason': error_list[0].get('reason') if error_list else None,
             'message': error_info.get('message'),
-            'errors': error_info.get('errors', []),
+            'errors': error_list,
         }
+        return {video_id: (None, error) for video_id in video_ids}
     
     # Check HTTP status
     if not response.ok:
-        return None, {
+        error = {
             'status_code': status_code,
             'message': response.text[:200],
         }
+        return {video_id: (None, error) for video_id in video_ids}
+    
+    # Every item in one response was fetched at the same moment: one
+    # timestamp for the whole batch
+    extracted_at = datetime.now(timezone.utc).isoformat()
+    results: dict[str, tuple[Optional[dict], Optional[dict]]] = {}
+    for item in data.get('items') or []:
+        video_id = item.get('id')
+        if video_id in results or video_id not in video_ids:
+            continue
+        metadata = _parse_video_item(video_id, item)
+        metadata['_extracted_at'] = extracted_at
+        results[video_id] = (metadata, None)
     
-    if not data.get('items'):
-        return None, {'status_code': status_code, 'message': 'Video not found'}
+    not_found = {'status_code': status_code, 'reason': 'videoNotFound', 'message': 'Video not found'}
+    for video_id in video_ids:
+        results.setdefault(video_id, (None, not_found))
+    return results
+
+
+def _is_not_found_error(error: Optional[dict]) -> bool:
+    """
+    Check whether a fetch error means the video no longer exists.
+    
+    Classifies on the structured 'reason' code set by fetch_videos_metadata
+    rather than on the message text.
+    
+    Args:
+        error: Error details dict from fetch_video(s)_metadata
+        
+    Returns:
+        True if the video is missing, deleted or private
+    """
+    return isinstance(error, dict) and error.get('reason') in _NOT_FOUND_REASONS
+
+
+def _parse_video_item(video_id: str, item: dict) -> dict:
+    """
+    Convert a videos.list response item to the cached video metadata shape.
     
-    item = data['items'][0]
+    Args:
+        video_id: YouTube video ID
+        item: Item from the API response
+        
+    Returns:
+        Video metadata dict
+    """
     snippet = item.get('snippet', {})
     statistics = item.get('statistics', {})
     topic_details = item.get('topicDetails', {})
@@ -480,40 +843,145 @@ def fetch_video_metadata(video_id: str, api_key: str) -> tuple[Optional[dict], O
             'relevantTopicIds': topic_details.get('relevantTopicIds', []),
             'topicCategories': topic_details.get('topicCategories', []),
         },
-    }, None
+    }
 
 
-def fetch_channel_metadata(channel_id: str, api_key: str) -> Optional[dict]:
+def _project_video(video_id: str, payload: dict, added_at: str) -> dict:
+    """
+    Build the enriched-output record for a video from its cached metadata.
+    
+    Shared by every command that writes enriched videos, whether the
+    payload came from the cache or was just fetched.
+    
+    Args:
+        video_id: YouTube video ID
+        payload: Cached video metadata (as returned by fetch_video_metadata)
+        added_at: Timestamp the video was added to the playlist
+        
+    Returns:
+        Output video dict
+    """
+    get = payload.get
+    return {
+        'video_id': video_id,
+        'title': get('title'),
+        'description': get('description'),
+        'thumbnail_url': get('thumbnail_url'),
+        'channel_id': get('channel_id'),
+        'privacy_status': get('privacy_status'),
+        'statistics': get('statistics'),
+        'topicDetails': get('topicDetails'),
+        'video_data_extracted_at': get('_extracted_at'),
+        'added_at': added_at,
+    }
+
+
+def _project_channel(channel_id: str, payload: dict) -> dict:
+    """
+    Build the enriched-output record for a channel from its cached metadata.
+    
+    Args:
+        channel_id: YouTube channel ID
+        payload: Cached channel metadata (as returned by fetch_channel_metadata)
+        
+    Returns:
+        Output channel dict
+    """
+    get = payload.get
+    return {
+        'id': get('id', channel_id),
+        'title': get('title'),
+        'publishedAt': get('publishedAt'),
+        'channel_data_extracted_at': get('_extracted_at'),
+        'subscriber_count': get('subscriber_count'),
+        'url': get('url'),
+        'description': get('description'),
+        'thumbnail_url': get('thumbnail_url'),
+        'country': get('country'),
+        'topicIds': get('topicIds', []),
+        'topicCategories': get('topicCategories', []),
+    }
+
+
+def fetch_channel_metadata(
+    channel_id: str,
+    api_key: str,
+    session: Optional[requests.Session] = None,
+) -> Optional[dict]:
     """
     Fetch channel metadata from YouTube Data API v3.
     
     Args:
         channel_id: YouTube channel ID
         api_key: YouTube Data API key
+        session: HTTP session to use. Defaults to the shared module session
         
     Returns:
         Dict with channel metadata or None if not found
     """
+    return fetch_channels_metadata([channel_id], api_key, session).get(channel_id)
+
+
+def fetch_channels_metadata(
+    channel_ids: list[str],
+    api_key: str,
+    session: Optional[requests.Session] = None,
+) -> dict[str, dict]:
+    """
+    Fetch metadata for up to VIDEOS_PER_REQUEST channels in one API call.
+    
+    Args:
+        channel_ids: YouTube channel IDs (at most VIDEOS_PER_REQUEST)
+        api_key: YouTube Data API key
+        session: HTTP session to use. Defaults to the shared module session
+        
+    Returns:
+        Dict of channel_id -> channel metadata for the channels found, each
+        stamped with a shared '_extracted_at' time
+        
+    Raises:
+        requests.RequestException: On HTTP errors or an unreadable response
+    """
     url = f"{YOUTUBE_API_BASE}/channels"
     params = {
         'part': 'snippet,statistics,topicDetails,brandingSettings',
-        'id': channel_id,
+        'id': ','.join(channel_ids),
         'key': api_key,
     }
     
-    response = requests.get(url, params=params, timeout=10)
+    response = (session or _SESSION).get(url, params=params, timeout=10)
     response.raise_for_status()
     
-    data = response.json()
+    try:
+        data = json_loads(response.content)
+    except ValueError as e:
+        raise requests.RequestException(f"Invalid JSON in channels response: {e}") from e
     
-    if not data.get('items'):
-        return None
+    extracted_at = datetime.now(timezone.utc).isoformat()
+    results = {}
+    for item in data.get('items') or []:
+        channel_id = item.get('id')
+        if channel_id in channel_ids and channel_id not in results:
+            metadata = _parse_channel_item(channel_id, item)
+            metadata['_extracted_at'] = extracted_at
+            results[channel_id] = metadata
+    return results
+
+
+def _parse_channel_item(channel_id: str, item: dict) -> dict:
+    """
+    Convert a channels.list response item to the cached channel metadata shape.
     
-    item = data['items'][0]
+    Args:
+        channel_id: YouTube channel ID
+        item: Item from the API response
+        
+    Returns:
+        Channel metadata dict
+    """
     snippet = item.get('snippet', {})
     statistics = item.get('statistics', {})
     topic_details = item.get('topicDetails', {})
-    branding = item.get('brandingSettings', {})
 
     thumbnails = snippet.get('thumbnails', {})
     default_thumbnail = thumbnails.get('default', {}).get('url', '')
@@ -532,7 +1000,14 @@ def fetch_channel_metadata(channel_id: str, api_key: str) -> Optional[dict]:
     }
 
 
-def enrich_playlist(input_path: Path, output_path: Path, api_key: str, verbose: bool = False, sqlite_path: Optional[Path] = None):
+def enrich_playlist(
+    input_path: Path,
+    output_path: Path,
+    api_key: str,
+    verbose: bool = False,
+    sqlite_path: Optional[Path] = None,
+    compact: bool = False,
+):
     """
     Enrich Google Takeout playlist CSV with YouTube metadata.
     
@@ -542,7 +1017,7 @@ def enrich_playlist(input_path: Path, output_path: Path, api_key: str, verbose:
         api_key: YouTube Data API key
         verbose: Enable verbose logging
         sqlite_path: Optional path to output SQLite database
-        verbose: Enable verbose logging
+        compact: Write single-line instead of indented JSON
     """
     # Parse input CSV
     videos = parse_takeout_csv(input_path)
@@ -557,232 +1032,251 @@ def enrich_playlist(input_path: Path, output_path: Path, api_key: str, verbose:
     api_calls = 0
     api_success = 0
     api_errors = 0
-    consecutive_api_errors = 0
     videos_not_found = 0
     processing_errors = 0
     errors = []
-    aborted = False
+    abort_policy = AbortPolicy()
     
-    with Cache() as cache:
+    with Cache() as cache, ErrorLog() as error_log:
         if verbose:
             stats = cache.stats()
             print(f"Cache: {stats['videos']} videos, {stats['channels']} channels")
         
-        # Process videos with progress bar
-        progress = tqdm(videos, desc="Enriching videos", unit="video")
-        for video in progress:
-            video_id = video['video_id']
-            added_at = video['added_at']
+        # Partition up front: cached videos come from one bulk lookup, and
+        # only misses are fetched, in VIDEOS_PER_REQUEST-sized batches on a
+        # thread pool a bounded window ahead of the loop below. Results are
+        # still consumed in playlist order, so error accounting and the abort
+        # threshold behave as before.
+        unique_ids = list(dict.fromkeys(video['video_id'] for video in videos))
+        cached_videos = cache.get_videos(unique_ids)
+        # Videos recently reported as deleted/private are not asked for again
+        known_missing = cache.get_videos_not_found(
+            vid for vid in unique_ids if vid not in cached_videos
+        )
+        miss_ids = [vid for vid in unique_ids if vid not in cached_videos and vid not in known_missing]
+        newly_missing: list[str] = []  # recorded in one write after the loop
+        miss_batches = iter(range(0, len(miss_ids), VIDEOS_PER_REQUEST))
+        pending: dict[str, Future] = {}
+        counted_fetches: set[Future] = set()
+        executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        
+        def schedule_fetches():
+            while len(pending) < FETCH_WORKERS * VIDEOS_PER_REQUEST:
+                start = next(miss_batches, None)
+                if start is None:
+                    return
+                batch = miss_ids[start:start + VIDEOS_PER_REQUEST]
+                future = executor.submit(fetch_videos_metadata, batch, api_key)
+                for vid in batch:
+                    pending[vid] = future
+        
+        # Look-ahead requests must not outlive the loop, even on an error
+        try:
+            # Process videos with progress bar
+            progress = tqdm(videos, desc="Enriching videos", unit="video")
+            
+            def show_stats():
+                # refresh=False only stores the postfix; the bar redraws it on its
+                # own mininterval schedule (and on close) instead of per call
+                progress.set_postfix({
+                    'cached': video_cache_hits,
+                    'fetched': api_success,
+                    'not_found': videos_not_found,
+                    'errors': processing_errors,
+                }, refresh=False)
+            
+            # Decided once here and carried forward: the policy's window is
+            # time-based, so asking it again later could give another answer
+            aborted = False
+            for video in progress:
+                if abort_policy.should_abort():
+                    aborted = True
+                    break
+                
+                video_id = video['video_id']
+                added_at = video['added_at']
+
+                cached_video = cached_videos.get(video_id)
+                if cached_video:
+                    video_cache_hits += 1
+                    # Cached and fetched dicts are only read below, never mutated
+                    video_payload = cached_video
+                elif video_id in known_missing:
+                    videos_not_found += 1
+                    enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': 'Video not found'})
+                    continue
+                else:
+                    # One request serves the whole batch: its API call, cache
+                    # write and any abort-policy failure are counted once, by
+                    # the first video consumed from it; the rest of the batch
+                    # only gets per-video error entries
+                    first_use = True
+                    try:
+                        schedule_fetches()
+                        future = pending.pop(video_id, None)
+                        if future is not None:
+                            first_use = future not in counted_fetches
+                            if first_use:
+                                counted_fetches.add(future)
+                                api_calls += 1
+                            batch_results = future.result()
+                            if first_use:
+                                cache.put_videos(
+                                    (vid, metadata) for vid, (metadata, _) in batch_results.items() if metadata
+                                )
+                            video_metadata, api_error = batch_results[video_id]
+                        else:
+                            api_calls += 1
+                            video_metadata, api_error = fetch_video_metadata(video_id, api_key)
+                            if video_metadata:
+                                cache.put_video(video_id, video_metadata)
 
-            cached_video = cache.get_video(video_id)
-            if cached_video:
-                video_cache_hits += 1
-                video_extracted_at = cached_video.get('_extracted_at')
-                video_payload = cached_video.copy()
-            else:
-                try:
-                    video_metadata, api_error = fetch_video_metadata(video_id, api_key)
-                    api_calls += 1
+                        if api_error:
+                            api_errors += 1
+                            error_msg = api_error.get('message', 'API error') if isinstance(api_error, dict) else str(api_error)
+                            errors.append({'video_id': video_id, 'error': error_msg})
+                            error_log.write(video_id, error_msg, error_details=api_error if isinstance(api_error, dict) else None)
+                            enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': error_msg})
+                            
+                            # Missing videos are expected; only other errors count toward aborting
+                            if _is_not_found_error(api_error):
+                                videos_not_found += 1
+                                newly_missing.append(video_id)
+                                known_missing.add(video_id)
+                            elif first_use:
+                                abort_policy.record_failure(api_error.get('status_code') if isinstance(api_error, dict) else None)
+                            
+                            show_stats()
+                            continue
+
+                        if not video_metadata:
+                            api_errors += 1
+                            videos_not_found += 1
+                            error_msg = 'Video not found (may be deleted or private)'
+                            errors.append({'video_id': video_id, 'error': error_msg})
+                            error_log.write(video_id, error_msg)
+                            newly_missing.append(video_id)
+                            known_missing.add(video_id)
+                            enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': 'Video not found'})
+                            show_stats()
+                            continue
 
-                    if api_error:
+                        api_success += 1
+                        show_stats()
+
+                        cached_videos[video_id] = video_metadata
+                        video_payload = video_metadata
+                    except requests.RequestException as e:
                         api_errors += 1
-                        error_msg = api_error.get('message', 'API error') if isinstance(api_error, dict) else str(api_error)
+                        processing_errors += 1
+                        if first_use:
+                            abort_policy.record_failure(_response_status(e))
+                        error_msg = str(e)
                         errors.append({'video_id': video_id, 'error': error_msg})
-                        write_error_to_log(video_id, error_msg, error_details=api_error if isinstance(api_error, dict) else None)
-                        enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': error_msg})
-                        
-                        # Only count as consecutive error if NOT "Video not found"
-                        is_not_found = 'not found' in error_msg.lower()
-                        if is_not_found:
-                            videos_not_found += 1
-                            consecutive_api_errors = 0
-                        else:
-                            consecutive_api_errors += 1
-                        
-                        progress.set_postfix({
-                            'cached': video_cache_hits,
-                            'fetched': api_success,
-                            'not_found': videos_not_found,
-                            'errors': processing_errors,
-                        })
-                        if consecutive_api_errors >= 10:
-                            aborted = True
-                            break
+                        error_log.write(video_id, error_msg, error_obj=e)
+                        enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': str(e)})
+                        show_stats()
                         continue
-
-                    if not video_metadata:
+                    except Exception as e:
+                        # Catch unexpected errors (like the 'str' object has no attribute 'get' error)
                         api_errors += 1
-                        videos_not_found += 1
-                        error_msg = 'Video not found (may be deleted or private)'
+                        processing_errors += 1
+                        error_msg = f"Processing error: {str(e)}"
                         errors.append({'video_id': video_id, 'error': error_msg})
-                        write_error_to_log(video_id, error_msg)
-                        enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': 'Video not found'})
-                        progress.set_postfix({
-                            'cached': video_cache_hits,
-                            'fetched': api_success,
-                            'not_found': videos_not_found,
-                            'errors': processing_errors,
-                        })
-                        consecutive_api_errors = 0
-                        continue
-
-                    api_success += 1
-                    consecutive_api_errors = 0
-                    progress.set_postfix({
-                        'cached': video_cache_hits,
-                        'fetched': api_success,
-                        'not_found': videos_not_found,
-                        'errors': processing_errors,
-                    })
-
-                    video_extracted_at = datetime.now(timezone.utc).isoformat()
-                    video_metadata['_extracted_at'] = video_extracted_at
-                    cache.put_video(video_id, video_metadata)
-                    video_payload = video_metadata.copy()
-                except requests.RequestException as e:
-                    api_errors += 1
-                    consecutive_api_errors += 1
-                    processing_errors += 1
-                    error_msg = str(e)
-                    errors.append({'video_id': video_id, 'error': error_msg})
-                    write_error_to_log(video_id, error_msg, error_obj=e)
-                    enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': str(e)})
-                    progress.set_postfix({
-                        'cached': video_cache_hits,
-                        'fetched': api_success,
-                        'not_found': videos_not_found,
-                        'errors': processing_errors,
-                    })
-                    if consecutive_api_errors >= 10:
-                        aborted = True
-                        break
-                    continue
-                except Exception as e:
-                    # Catch unexpected errors (like the 'str' object has no attribute 'get' error)
-                    api_errors += 1
-                    processing_errors += 1
-                    error_msg = f"Processing error: {str(e)}"
-                    errors.append({'video_id': video_id, 'error': error_msg})
-                    write_error_to_log(video_id, error_msg, error_obj=e)
-                    enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': error_msg})
-                    progress.set_postfix({
-                        'cached': video_cache_hits,
-                        'fetched': api_success,
-                        'not_found': videos_not_found,
-                        'errors': processing_errors,
-                    })
-                    consecutive_api_errors = 0  # Don't count unexpected errors toward abort threshold
-                    continue
+                        error_log.write(video_id, error_msg, error_obj=e)
+                        enriched_videos.append({'video_id': video_id, 'added_at': added_at, 'error': error_msg})
+                        show_stats()
+                        continue  # Unexpected errors don't count toward aborting
 
-            channel_id = video_payload.get('channel_id')
-            channel_extracted_at = None
+                enriched_videos.append(_project_video(video_id, video_payload, added_at))
 
-            if channel_id:
-                if channel_id in channels_by_id:
-                    channel_data = channels_by_id[channel_id]
-                    channel_extracted_at = channel_data.get('_extracted_at')
-                else:
-                    cached_channel = cache.get_channel(channel_id)
-                    if cached_channel:
-                        channel_cache_hits += 1
-                        channel_data = cached_channel.copy()
-                    else:
-                        try:
-                            channel_metadata = fetch_channel_metadata(channel_id, api_key)
-                            api_calls += 1
-                            if channel_metadata:
-                                api_success += 1
-                                consecutive_api_errors = 0
-                                progress.set_postfix({
-                                    'cached': video_cache_hits,
-                                    'fetched': api_success,
-                                    'not_found': videos_not_found,
-                                    'errors': processing_errors,
-                                })
-                                channel_extracted_at = datetime.now(timezone.utc).isoformat()
-                                channel_metadata['_extracted_at'] = channel_extracted_at
-                                cache.put_channel(channel_id, channel_metadata)
-                                channel_data = channel_metadata.copy()
-                            else:
-                                api_errors += 1
-                                consecutive_api_errors += 1
-                                progress.set_postfix({
-                                    'cached': video_cache_hits,
-                                    'fetched': api_success,
-                                    'not_found': videos_not_found,
-                                    'errors': processing_errors,
-                                })
-                                channel_data = None
-                        except requests.RequestException:
-                            api_errors += 1
-                            consecutive_api_errors += 1
-                            processing_errors += 1
-                            progress.set_postfix({
-                                'cached': video_cache_hits,
-                                'fetched': api_success,
-                                'not_found': videos_not_found,
-                                'errors': processing_errors,
-                            })
-                            channel_data = None
-                        except Exception as e:
-                            api_errors += 1
-                            processing_errors += 1
-                            write_error_to_log(channel_id, f"Channel processing error: {str(e)}", error_obj=e)
-                            progress.set_postfix({
-                                'cached': video_cache_hits,
-                                'fetched': api_success,
-                                'not_found': videos_not_found,
-                                'errors': processing_errors,
-                            })
-                            channel_data = None
-
-                        if consecutive_api_errors >= 10:
+            # Also true when the last video's failure reached the threshold
+            aborted = aborted or abort_policy.should_abort()
+            
+            if newly_missing:
+                cache.put_videos_not_found(newly_missing)
+
+            # Channels are resolved once per unique ID after the video pass:
+            # cached ones with one bulk lookup, the rest with batched
+            # channels.list calls run on the same thread pool
+            if not aborted:
+                channel_ids = list(dict.fromkeys(
+                    video['channel_id'] for video in enriched_videos if video.get('channel_id')
+                ))
+                cached_channels = cache.get_channels(channel_ids)
+                channel_cache_hits = len(cached_channels)
+                
+                missing_ids = [cid for cid in channel_ids if cid not in cached_channels]
+                channel_batches = [
+                    missing_ids[start:start + VIDEOS_PER_REQUEST]
+                    for start in range(0, len(missing_ids), VIDEOS_PER_REQUEST)
+                ]
+                channel_futures = [
+                    executor.submit(fetch_channels_metadata, batch, api_key)
+                    for batch in channel_batches
+                ]
+                
+                fetched_channels: dict[str, dict] = {}
+                for batch, future in zip(channel_batches, channel_futures):
+                    api_calls += 1
+                    try:
+                        batch_metadata = future.result()
+                    except requests.RequestException as e:
+                        api_errors += len(batch)
+                        processing_errors += len(batch)
+                        # str(e) would include the request URL, API key and all
+                        status_code = _response_status(e)
+                        error_msg = (
+                            f"Channel request failed with HTTP {status_code}"
+                            if status_code is not None
+                            else f"Channel request failed: {type(e).__name__}"
+                        )
+                        for channel_id in batch:
+                            errors.append({'channel_id': channel_id, 'error': error_msg})
+                            error_log.write(channel_id, error_msg, error_obj=e)
+                        abort_policy.record_failure(status_code)
+                        if abort_policy.should_abort():
                             aborted = True
                             break
-
+                        continue
+                    except Exception as e:
+                        api_errors += len(batch)
+                        processing_errors += len(batch)
+                        error_msg = f"Channel processing error: {str(e)}"
+                        for channel_id in batch:
+                            errors.append({'channel_id': channel_id, 'error': error_msg})
+                            error_log.write(channel_id, error_msg, error_obj=e)
+                        continue
+                    
+                    for channel_id in batch:
+                        channel_metadata = batch_metadata.get(channel_id)
+                        if channel_metadata:
+                            api_success += 1
+                            fetched_channels[channel_id] = channel_metadata
+                        else:
+                            api_errors += 1
+                
+                if fetched_channels:
+                    cache.put_channels(fetched_channels.items())
+                
+                # Keep first-appearance order for the output
+                for channel_id in channel_ids:
+                    channel_data = cached_channels.get(channel_id) or fetched_channels.get(channel_id)
                     if channel_data:
-                        channel_extracted_at = channel_data.get('_extracted_at')
                         channels_by_id[channel_id] = channel_data
-
-            output_video = {
-                'video_id': video_id,
-                'title': video_payload.get('title'),
-                'description': video_payload.get('description'),
-                'thumbnail_url': video_payload.get('thumbnail_url'),
-                'channel_id': channel_id,
-                'privacy_status': video_payload.get('privacy_status'),
-                'statistics': video_payload.get('statistics'),
-                'topicDetails': video_payload.get('topicDetails'),
-                'video_data_extracted_at': video_payload.get('_extracted_at'),
-                'added_at': added_at,
-            }
-
-            enriched_videos.append(output_video)
-
-            if aborted:
-                break
-
+        finally:
+            # Drop look-ahead requests left over after an abort or error
+            executor.shutdown(wait=False, cancel_futures=True)
+        
         if aborted:
             progress.close()
-            print("Aborting: 10 consecutive API call errors.")
+            print(f"Aborting: {abort_policy.describe()}.")
             return
     
     # Write output JSON
-    channels_output = {}
-    for cid, channel_data in channels_by_id.items():
-        channels_output[cid] = {
-            'id': channel_data.get('id', cid),
-            'title': channel_data.get('title'),
-            'publishedAt': channel_data.get('publishedAt'),
-            'channel_data_extracted_at': channel_data.get('_extracted_at'),
-            'subscriber_count': channel_data.get('subscriber_count'),
-            'url': channel_data.get('url'),
-            'description': channel_data.get('description'),
-            'thumbnail_url': channel_data.get('thumbnail_url'),
-            'country': channel_data.get('country'),
-            'topicIds': channel_data.get('topicIds', []),
-            'topicCategories': channel_data.get('topicCategories', []),
-        }
+    channels_output = {
+        cid: _project_channel(cid, channel_data) for cid, channel_data in channels_by_id.items()
+    }
 
     output = {
         'metadata': {
@@ -801,8 +1295,7 @@ def enrich_playlist(input_path: Path, output_path: Path, api_key: str, verbose:
         'videos': enriched_videos,
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    write_json_file(output_path, output, compact=compact)
     
     # Export to SQLite if path provided
     if sqlite_path:
@@ -833,7 +1326,7 @@ def export_to_sqlite(
     enriched_videos: list[dict],
     channels_by_id: dict[str, dict],
     playlist_info: Optional[dict] = None,
-    video_to_playlists: Optional[dict[str, list[str]]] = None,
+    video_to_playlist_ids: Optional[dict[str, list[str]]] = None,
 ) -> None:
     """
     Export enriched playlist data to a self-contained SQLite database.
@@ -843,15 +1336,83 @@ def export_to_sqlite(
         enriched_videos: List of enriched video dictionaries
         channels_by_id: Dict of channel_id -> channel data
         playlist_info: Optional dict with playlist metadata (from takeout CSV)
-        video_to_playlists: Optional dict mapping video_id -> list of playlist names
+        video_to_playlist_ids: Optional dict mapping video_id -> list of distinct
+            playlist IDs, used for the video_playlists junction table
     """
-    # Remove existing database if it exists
-    if db_path.exists():
-        db_path.unlink()
-    
-    conn = sqlite3.connect(str(db_path))
+    # Build the whole database in memory, then copy it to disk in one pass
+    # with VACUUM INTO: the file is written sequentially with no journal,
+    # comes out fully packed, and an existing export is only replaced once
+    # the new one has been built successfully. Autocommit mode: the bulk
+    # load below runs in one explicit transaction.
+    conn = sqlite3.connect(":memory:", isolation_level=None)
     cursor = conn.cursor()
     
+    # VACUUM INTO keeps the source page size, so set it here; it only takes
+    # effect before the first table is created
+    cursor.execute("PRAGMA page_size=8192")
+    cursor.execute("PRAGMA cache_size=-65536")
+    
+    try:
+        # Schema and data go in one transaction: a single commit for the
+        # whole export, and no half-loaded tables if anything below fails
+        cursor.execute("BEGIN")
+        try:
+            _write_export_tables(
+                cursor, enriched_videos, channels_by_id, playlist_info, video_to_playlist_ids
+            )
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        
+        # VACUUM INTO refuses to overwrite an existing file, so write a
+        # temporary sibling and swap it in; a failure leaves the previous
+        # export untouched
+        tmp_path = db_path.with_name(db_path.name + '.tmp')
+        tmp_path.unlink(missing_ok=True)
+        try:
+            cursor.execute("VACUUM INTO ?", (str(tmp_path),))
+            os.replace(tmp_path, db_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    finally:
+        conn.close()
+
+
+def _to_int(value) -> Optional[int]:
+    """
+    Convert an API count to int without raising.
+    
+    The API sends counts as digit strings, so the common case is a plain
+    isdecimal() check rather than a try/except around int().
+    
+    Args:
+        value: Count as str or int (or None)
+        
+    Returns:
+        Integer value, or None if missing or not a number
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
+    return None
+
+
+def _json_list(values: Optional[list]) -> str:
+    """Encode a list column as compact JSON; empty or missing lists skip the encoder."""
+    return json_dumps_compact(values) if values else _EMPTY_JSON_LIST
+
+
+def _write_export_tables(
+    cursor: sqlite3.Cursor,
+    enriched_videos: list[dict],
+    channels_by_id: dict[str, dict],
+    playlist_info: Optional[dict],
+    video_to_playlist_ids: Optional[dict[str, list[str]]],
+) -> None:
+    """Create the export schema and load all rows (caller owns the transaction)."""
     # Create videos table
     cursor.execute("""
         CREATE TABLE videos (
@@ -865,7 +1426,6 @@ def export_to_sqlite(
             like_count INTEGER,
             comment_count INTEGER,
             topics TEXT,
-            playlists TEXT,
             added_at TEXT,
             extracted_at TEXT,
             error TEXT,
@@ -903,54 +1463,49 @@ def export_to_sqlite(
         )
     """)
     
-    # Create video_playlists junction table for many-to-many relationship
+    # Create video_playlists junction table for many-to-many relationship.
+    # Its (video_id, playlist_id) key is a unique index built after the load
+    # instead of a PRIMARY KEY maintained row by row.
     cursor.execute("""
         CREATE TABLE video_playlists (
             video_id TEXT,
             playlist_id TEXT,
             added_at TEXT,
-            PRIMARY KEY (video_id, playlist_id),
             FOREIGN KEY (video_id) REFERENCES videos(id),
             FOREIGN KEY (playlist_id) REFERENCES playlists(id)
         )
     """)
     
     # Insert channels
+    channel_rows = []
     for channel_id, channel_data in channels_by_id.items():
-        try:
-            subscriber_count = int(channel_data.get('subscriber_count', 0)) if channel_data.get('subscriber_count') else None
-        except (ValueError, TypeError):
-            subscriber_count = None
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO channels (
-                id, title, description, url, thumbnail_url, country,
-                subscriber_count, published_at, topic_ids, topic_categories, extracted_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        channel_rows.append((
             channel_id,
             channel_data.get('title'),
             channel_data.get('description'),
             channel_data.get('url'),
             channel_data.get('thumbnail_url'),
             channel_data.get('country'),
-            subscriber_count,
+            _to_int(channel_data.get('subscriber_count')),
             channel_data.get('publishedAt'),
-            json.dumps(channel_data.get('topicIds', [])),
-            json.dumps(channel_data.get('topicCategories', [])),
+            _json_list(channel_data.get('topicIds')),
+            _json_list(channel_data.get('topicCategories')),
             channel_data.get('_extracted_at'),
         ))
     
+    cursor.executemany("""
+        INSERT INTO channels (
+            id, title, description, url, thumbnail_url, country,
+            subscriber_count, published_at, topic_ids, topic_categories, extracted_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, channel_rows)
+    
     # Insert playlists if provided
-    playlist_id_map = {}  # title -> id mapping for junction table
     if playlist_info:
+        playlist_rows = []
         for playlist_id, pdata in playlist_info.items():
             add_new = 1 if pdata.get('add_new_videos_to_top', '').lower() == 'true' else 0
-            cursor.execute("""
-                INSERT OR REPLACE INTO playlists (
-                    id, title, visibility, video_order, created_at, updated_at, add_new_videos_to_top
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            playlist_rows.append((
                 playlist_id,
                 pdata.get('title'),
                 pdata.get('visibility'),
@@ -959,84 +1514,97 @@ def export_to_sqlite(
                 pdata.get('updated_at'),
                 add_new,
             ))
-            # Map title to ID for junction table
-            if pdata.get('title'):
-                playlist_id_map[pdata['title']] = playlist_id
+        
+        cursor.executemany("""
+            INSERT INTO playlists (
+                id, title, visibility, video_order, created_at, updated_at, add_new_videos_to_top
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, playlist_rows)
     
     # Insert videos
+    # The file is new, so the only possible key conflicts are videos listed
+    # more than once; keyed here so the last one wins, as REPLACE did
+    video_rows: dict[str, tuple] = {}
+    video_playlist_rows = []
     for video in enriched_videos:
         video_id = video.get('video_id')
         if not video_id:
             continue
         
+        # Video-playlist relationships, taken from a video's first occurrence.
+        # Each video's playlist IDs are already unique, so rows need no
+        # per-pair duplicate check.
+        if video_to_playlist_ids and video_id not in video_rows:
+            added_at = video.get('added_at')
+            video_playlist_rows.extend(
+                (video_id, playlist_id, added_at) for playlist_id in video_to_playlist_ids.get(video_id, ())
+            )
+        
         # Extract statistics
         stats = video.get('statistics') or {}
-        try:
-            view_count = int(stats.get('viewCount', 0)) if stats.get('viewCount') else None
-        except (ValueError, TypeError):
-            view_count = None
-        try:
-            like_count = int(stats.get('likeCount', 0)) if stats.get('likeCount') else None
-        except (ValueError, TypeError):
-            like_count = None
-        try:
-            comment_count = int(stats.get('commentCount', 0)) if stats.get('commentCount') else None
-        except (ValueError, TypeError):
-            comment_count = None
         
         # Extract topics as JSON-encoded list
         topic_details = video.get('topicDetails') or {}
-        topics = topic_details.get('topicCategories', [])
-        
-        # Get playlists this video appears in
-        playlists_list = video.get('appears_in_playlists', [])
-        if not playlists_list and video_to_playlists:
-            playlists_list = video_to_playlists.get(video_id, [])
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO videos (
-                id, title, description, thumbnail_url, channel_id, privacy_status,
-                view_count, like_count, comment_count, topics, playlists,
-                added_at, extracted_at, error
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        topics = topic_details.get('topicCategories')
+        
+        video_rows[video_id] = (
             video_id,
             video.get('title'),
             video.get('description'),
             video.get('thumbnail_url'),
             video.get('channel_id'),
             video.get('privacy_status'),
-            view_count,
-            like_count,
-            comment_count,
-            json.dumps(topics),
-            json.dumps(playlists_list),
+            _to_int(stats.get('viewCount')),
+            _to_int(stats.get('likeCount')),
+            _to_int(stats.get('commentCount')),
+            _json_list(topics),
             video.get('added_at'),
             video.get('video_data_extracted_at') or video.get('_extracted_at'),
             video.get('error'),
-        ))
-        
-        # Insert video-playlist relationships
-        for playlist_name in playlists_list:
-            playlist_id = playlist_id_map.get(playlist_name)
-            if playlist_id:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO video_playlists (video_id, playlist_id, added_at)
-                    VALUES (?, ?, ?)
-                """, (video_id, playlist_id, video.get('added_at')))
+        )
     
-    # Create indexes for better query performance
+    cursor.executemany("""
+        INSERT INTO videos (
+            id, title, description, thumbnail_url, channel_id, privacy_status,
+            view_count, like_count, comment_count, topics,
+            added_at, extracted_at, error
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, video_rows.values())
+    cursor.executemany("""
+        INSERT INTO video_playlists (video_id, playlist_id, added_at)
+        VALUES (?, ?, ?)
+    """, video_playlist_rows)
+    
+    # Indexes are built once over the loaded rows rather than maintained per insert
+    cursor.execute("CREATE UNIQUE INDEX idx_video_playlists_pk ON video_playlists(video_id, playlist_id)")
     cursor.execute("CREATE INDEX idx_videos_channel_id ON videos(channel_id)")
     cursor.execute("CREATE INDEX idx_videos_added_at ON videos(added_at)")
     cursor.execute("CREATE INDEX idx_video_playlists_playlist_id ON video_playlists(playlist_id)")
     
-    conn.commit()
-    conn.close()
+    # Playlist membership lives only in video_playlists; this view adds it
+    # back as a JSON array of titles for queries that want one row per video
+    cursor.execute("""
+        CREATE VIEW videos_with_playlists AS
+        SELECT videos.*, (
+            SELECT json_group_array(title) FROM (
+                SELECT playlists.title AS title
+                FROM video_playlists
+                JOIN playlists ON playlists.id = video_playlists.playlist_id
+                WHERE video_playlists.video_id = videos.id
+                ORDER BY video_playlists.rowid
+            )
+        ) AS playlists
+        FROM videos
+    """)
+
+    # Planner statistics for the finished tables, so queries against the
+    # exported file (e.g. the video_playlists joins) pick the right indexes
+    cursor.execute("ANALYZE")
 
 
 def get_config_dir() -> Path:
     """
-    Get the YouTube Helper config directory.
+    Get the YouTube Helper config directory, creating it if needed.
     
     Returns:
         Path to ~/.youtube-helper/
@@ -1050,10 +1618,13 @@ def get_api_key_path() -> Path:
     """
     Get the path to the stored API key file.
     
+    Does not create the config directory, so looking up the key (done on
+    every command that calls the API) costs no mkdir.
+    
     Returns:
         Path to ~/.youtube-helper/api_key
     """
-    return get_config_dir() / "api_key"
+    return Path.home() / ".youtube-helper" / "api_key"
 
 
 def save_api_key(api_key: str) -> None:
@@ -1063,11 +1634,11 @@ def save_api_key(api_key: str) -> None:
     Args:
         api_key: YouTube Data API key
     """
+    get_config_dir()
     api_key_path = get_api_key_path()
     
     # Write the API key
-    with open(api_key_path, 'w') as f:
-        f.write(api_key.strip())
+    api_key_path.write_text(api_key.strip())
     
     # Set permissions to 600 (rw-------)
     os.chmod(api_key_path, 0o600)
@@ -1080,14 +1651,11 @@ def load_api_key() -> Optional[str]:
     Returns:
         API key if found, None otherwise
     """
-    api_key_path = get_api_key_path()
-    
-    if not api_key_path.exists():
+    try:
+        api_key = get_api_key_path().read_text().strip()
+    except FileNotFoundError:
         return None
     
-    with open(api_key_path, 'r') as f:
-        api_key = f.read().strip()
-    
     return api_key if api_key else None
 
 
@@ -1098,13 +1666,11 @@ def remove_api_key() -> bool:
     Returns:
         True if file was removed, False if not found
     """
-    api_key_path = get_api_key_path()
-    
-    if api_key_path.exists():
-        api_key_path.unlink()
-        return True
-    
-    return False
+    try:
+        get_api_key_path().unlink()
+    except FileNotFoundError:
+        return False
+    return True
 
 
 def get_api_key(provided_key: Optional[str] = None) -> Optional[str]:
@@ -1141,6 +1707,7 @@ def purge_cache() -> None:
     """
     with Cache() as cache:
         cache.clear()
+        cache.vacuum(0)
     
     print(f"✓ Cache purged")
 
@@ -1260,7 +1827,8 @@ def enrich_single_video(video_id: str, output_path: Optional[Path], api_key: str
         # Check cache first
         cached_video = cache.get_video(video_id)
         if cached_video:
-            video_metadata = cached_video.copy()
+            # Cached dicts are only read below, never mutated
+            video_metadata = cached_video
             source = "cache"
         else:
             # Fetch from API
@@ -1274,8 +1842,7 @@ def enrich_single_video(video_id: str, output_path: Optional[Path], api_key: str
                     'error_details': api_error if isinstance(api_error, dict) else None,
                 }
                 if output_path:
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        json.dump(output, f, indent=2, ensure_ascii=False)
+                    write_json_file(output_path, output)
                     print(f"✗ Video enrichment failed: {error_msg}")
                     print(f"  Output: {output_path}")
                 else:
@@ -1289,8 +1856,7 @@ def enrich_single_video(video_id: str, output_path: Optional[Path], api_key: str
                     'error': 'Video not found',
                 }
                 if output_path:
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        json.dump(output, f, indent=2, ensure_ascii=False)
+                    write_json_file(output_path, output)
                     print(f"✗ Video not found: {video_id}")
                     print(f"  Output: {output_path}")
                 else:
@@ -1298,7 +1864,6 @@ def enrich_single_video(video_id: str, output_path: Optional[Path], api_key: str
                 return
             
             # Cache the video
-            video_metadata['_extracted_at'] = datetime.now(timezone.utc).isoformat()
             cache.put_video(video_id, video_metadata)
             source = "api"
         
@@ -1309,12 +1874,11 @@ def enrich_single_video(video_id: str, output_path: Optional[Path], api_key: str
         if channel_id:
             cached_channel = cache.get_channel(channel_id)
             if cached_channel:
-                channel_metadata = cached_channel.copy()
+                channel_metadata = cached_channel
                 channel_source = "cache"
             else:
                 channel_metadata = fetch_channel_metadata(channel_id, api_key)
                 if channel_metadata:
-                    channel_metadata['_extracted_at'] = datetime.now(timezone.utc).isoformat()
                     cache.put_channel(channel_id, channel_metadata)
                     channel_source = "api"
     
@@ -1352,8 +1916,7 @@ def enrich_single_video(video_id: str, output_path: Optional[Path], api_key: str
     
     # Write output or print to stdout
     if output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        write_json_file(output_path, output)
         
         # Summary
         print(f"✓ Video enriched successfully")
@@ -1400,11 +1963,10 @@ def display_cache_info(verbose: bool = False):
             size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
         print(f"  Size: {size_str}")
         
-        # Timestamps
-        created_at = datetime.fromtimestamp(stat_info.st_birthtime)
-        modified_at = datetime.fromtimestamp(stat_info.st_mtime)
-        print(f"  Created: {created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  Modified: {modified_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        # Timestamps (st_birthtime is macOS/BSD only; elsewhere fall back to st_ctime)
+        created_ts = getattr(stat_info, 'st_birthtime', stat_info.st_ctime)
+        print(f"  Created: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created_ts))}")
+        print(f"  Modified: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat_info.st_mtime))}")
         
         # Permissions
         mode = stat_info.st_mode
@@ -1454,6 +2016,56 @@ def format_number(value: int) -> str:
         return str(value)
 
 
+def load_template(template_path: Optional[Path] = None):
+    """
+    Get the compiled Jinja2 template for rendering playlists.
+    
+    Args:
+        template_path: Path to custom Jinja2 template (default: built-in playlist.html)
+        
+    Returns:
+        Jinja2 Template
+    """
+    if template_path:
+        return _get_template(str(template_path.parent), template_path.name)
+    return _get_template(str(Path(__file__).parent / 'templates'), 'playlist.html')
+
+
+@lru_cache(maxsize=8)
+def _get_jinja_env(template_dir: str):
+    """Build the Jinja2 environment for a template directory once per process."""
+    # Imported here: only render and export need Jinja2
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+    
+    # Compiled templates are kept on disk so later runs skip parsing and
+    # compiling; entries are keyed by template path and source checksum, so
+    # an edited template is simply recompiled
+    try:
+        bytecode_dir = get_config_dir() / "jinja-cache"
+        bytecode_dir.mkdir(exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+    except OSError:
+        bytecode_cache = None
+    
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(['html', 'xml']),
+        auto_reload=False,
+        bytecode_cache=bytecode_cache,
+    )
+    
+    # Add custom filter for number formatting (once per environment)
+    env.filters['format_number'] = format_number
+    
+    return env
+
+
+@lru_cache(maxsize=32)
+def _get_template(template_dir: str, template_name: str):
+    """Compile a template once per process, sharing its directory's environment."""
+    return _get_jinja_env(template_dir).get_template(template_name)
+
+
 def render_playlist_to_html(
     input_path: Path,
     output_path: Path,
@@ -1470,43 +2082,25 @@ def render_playlist_to_html(
         template_path: Path to custom Jinja2 template (optional)
     """
     # Load enriched data
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = read_json_file(input_path)
     
     videos = data.get('videos', [])
     channels = data.get('channels', {})
     metadata = data.get('metadata', {})
     
-    # Setup Jinja2 environment
-    if template_path:
-        template_dir = template_path.parent
-        template_name = template_path.name
-    else:
-        # Use built-in template
-        template_dir = Path(__file__).parent / 'templates'
-        template_name = 'playlist.html'
+    template = load_template(template_path)
     
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        autoescape=select_autoescape(['html', 'xml'])
-    )
-    
-    # Add custom filter for number formatting
-    env.filters['format_number'] = format_number
-    
-    template = env.get_template(template_name)
-    
-    # Render template
-    html_content = template.render(
+    # Render straight into the output file instead of building the whole
+    # page as one string
+    stream = template.stream(
         title=title or 'YouTube Playlist',
         videos=videos,
         channels=channels,
         metadata=metadata,
     )
-    
-    # Write output
+    stream.enable_buffering(size=_RENDER_BUFFER_SIZE)
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        stream.dump(f)
     
     print(f"✓ Rendered {len(videos)} videos to {output_path}")
 
@@ -1526,27 +2120,6 @@ def get_export_output_path() -> Path:
     return exports_dir / f"{timestamp}.html"
 
 
-def parse_takeout_playlists_csv(playlists_csv_path: Path) -> dict[str, str]:
-    """
-    Parse Google Takeout playlists.csv to get playlist titles.
-    
-    Args:
-        playlists_csv_path: Path to playlists.csv
-        
-    Returns:
-        Dict mapping playlist ID to playlist title
-    """
-    playlists = {}
-    with open(playlists_csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            playlist_id = row.get('Playlist ID', '')
-            title = row.get('Playlist Title (Original)', '')
-            if playlist_id and title:
-                playlists[playlist_id] = title
-    return playlists
-
-
 def parse_takeout_playlists_csv_full(playlists_csv_path: Path) -> dict[str, dict]:
     """
     Parse Google Takeout playlists.csv to get full playlist information.
@@ -1557,19 +2130,31 @@ def parse_takeout_playlists_csv_full(playlists_csv_path: Path) -> dict[str, dict
     Returns:
         Dict mapping playlist ID to full playlist data
     """
+    fields = (
+        ('title', 'Playlist Title (Original)'),
+        ('visibility', 'Playlist Visibility'),
+        ('video_order', 'Playlist Video Order'),
+        ('created_at', 'Playlist Create Timestamp'),
+        ('updated_at', 'Playlist Update Timestamp'),
+        ('add_new_videos_to_top', 'Add new videos to top'),
+    )
     playlists = {}
-    with open(playlists_csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open(playlists_csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            id_idx = header.index('Playlist ID')
+        except ValueError as e:
+            raise ValueError(f"Unexpected CSV header in {playlists_csv_path}: {e}") from None
+        # Column positions resolved once; columns absent from the header read as ''
+        field_idx = [(key, header.index(column) if column in header else None) for key, column in fields]
+        
         for row in reader:
-            playlist_id = row.get('Playlist ID', '')
+            playlist_id = row[id_idx] if len(row) > id_idx else ''
             if playlist_id:
                 playlists[playlist_id] = {
-                    'title': row.get('Playlist Title (Original)', ''),
-                    'visibility': row.get('Playlist Visibility', ''),
-                    'video_order': row.get('Playlist Video Order', ''),
-                    'created_at': row.get('Playlist Create Timestamp', ''),
-                    'updated_at': row.get('Playlist Update Timestamp', ''),
-                    'add_new_videos_to_top': row.get('Add new videos to top', ''),
+                    key: row[idx] if idx is not None and idx < len(row) else ''
+                    for key, idx in field_idx
                 }
     return playlists
 
@@ -1600,9 +2185,9 @@ def process_takeout_export(
     if not playlists_csv.exists():
         raise FileNotFoundError(f"playlists.csv not found in {input_dir}")
     
-    # Parse playlists.csv to get playlist info (full info for SQLite, titles for display)
-    playlist_titles = parse_takeout_playlists_csv(playlists_csv)
+    # Parse playlists.csv once: full info for SQLite, titles derived for display
     playlist_full_info = parse_takeout_playlists_csv_full(playlists_csv)
+    playlist_titles = {pid: pdata['title'] for pid, pdata in playlist_full_info.items() if pdata['title']}
     
     if verbose:
         print(f"Found {len(playlist_titles)} playlists in playlists.csv")
@@ -1618,14 +2203,23 @@ def process_takeout_export(
     if verbose:
         print(f"Found {len(video_files)} playlist video files")
     
-    # Build mapping of video_id -> list of playlist names
+    # Build mapping of video_id -> list of playlist names (for display) and
+    # video_id -> list of playlist IDs (for the SQLite junction table), in
+    # one pass over the playlist files. Every video in all_videos gets an
+    # entry, so the enrichment loop indexes video_to_playlists directly.
     video_to_playlists: dict[str, list[str]] = {}
+    video_to_playlist_ids: dict[str, list[str]] = {}
     all_videos: list[dict] = []
     seen_video_ids: set[str] = set()
+    playlist_ids_by_title = {
+        pdata['title']: pid for pid, pdata in playlist_full_info.items() if pdata['title']
+    }
     
     for video_file in video_files:
         # Extract playlist name from filename (e.g., "Saved for later-videos.csv" -> "Saved for later")
         playlist_name = video_file.stem.replace("-videos", "")
+        # Resolved once per file rather than once per (video, playlist) pair
+        playlist_id = playlist_ids_by_title.get(playlist_name)
         
         videos = parse_takeout_csv(video_file)
         
@@ -1636,9 +2230,13 @@ def process_takeout_export(
             video_id = video['video_id']
             
             # Track which playlists this video appears in
-            if video_id not in video_to_playlists:
-                video_to_playlists[video_id] = []
-            video_to_playlists[video_id].append(playlist_name)
+            video_to_playlists.setdefault(video_id, []).append(playlist_name)
+            if playlist_id:
+                # A file is read in full before the next, so a repeat of this
+                # playlist can only be the video's most recent entry
+                playlist_ids = video_to_playlist_ids.setdefault(video_id, [])
+                if not playlist_ids or playlist_ids[-1] != playlist_id:
+                    playlist_ids.append(playlist_id)
             
             # Only add video once (use first occurrence for added_at)
             if video_id not in seen_video_ids:
@@ -1655,135 +2253,191 @@ def process_takeout_export(
     api_calls = 0
     api_success = 0
     api_errors = 0
-    consecutive_api_errors = 0
     videos_not_found = 0
     processing_errors = 0
-    aborted = False
+    abort_policy = AbortPolicy()
     
     with Cache() as cache:
-        progress = tqdm(all_videos, desc="Enriching videos", unit="video")
-        for video in progress:
-            video_id = video['video_id'].strip()
-            added_at = video['added_at']
-            
-            # Check cache first
-            cached = cache.get_video(video_id)
-            if cached:
-                video_cache_hits += 1
-                consecutive_api_errors = 0
-                video_payload = cached
-            else:
-                # Fetch from API
-                api_calls += 1
-                try:
-                    result, error_details = fetch_video_metadata(video_id, api_key)
+        # One bulk lookup instead of a cache query per video; the misses are
+        # fetched VIDEOS_PER_REQUEST at a time on a thread pool, a bounded
+        # window ahead of the loop below, which still consumes results in
+        # playlist order so error accounting and aborting are unchanged
+        cached_videos = cache.get_videos(video['video_id'] for video in all_videos)
+        miss_ids = [video['video_id'] for video in all_videos if video['video_id'] not in cached_videos]
+        miss_batches = iter(range(0, len(miss_ids), VIDEOS_PER_REQUEST))
+        pending: dict[str, Future] = {}
+        counted_fetches: set[Future] = set()
+        executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        
+        def schedule_fetches():
+            while len(pending) < FETCH_WORKERS * VIDEOS_PER_REQUEST:
+                start = next(miss_batches, None)
+                if start is None:
+                    return
+                batch = miss_ids[start:start + VIDEOS_PER_REQUEST]
+                future = executor.submit(fetch_videos_metadata, batch, api_key)
+                for vid in batch:
+                    pending[vid] = future
+        
+        # Look-ahead requests must not outlive the loop, even on an error
+        try:
+            progress = tqdm(all_videos, desc="Enriching videos", unit="video")
+            # Decided once here and carried forward: the policy's window is
+            # time-based, so asking it again later could give another answer
+            aborted = False
+            for video in progress:
+                if abort_policy.should_abort():
+                    aborted = True
+                    break
+                
+                video_id = video['video_id']
+                added_at = video['added_at']
+                
+                # Check cache first
+                cached = cached_videos.get(video_id)
+                if cached:
+                    video_payload = cached
+                    video_cache_hits += 1
+                else:
+                    # One request serves the whole batch: its API call, cache
+                    # write and any abort-policy failure are counted once, by
+                    # the first video consumed from it; the rest of the batch
+                    # only gets per-video error entries
+                    first_use = True
+                    try:
+                        schedule_fetches()
+                        future = pending.pop(video_id, None)
+                        if future is not None:
+                            first_use = future not in counted_fetches
+                            if first_use:
+                                counted_fetches.add(future)
+                                api_calls += 1
+                            batch_results = future.result()
+                            if first_use:
+                                cache.put_videos(
+                                    (vid, metadata) for vid, (metadata, _) in batch_results.items() if metadata
+                                )
+                            result, error_details = batch_results[video_id]
+                        else:
+                            api_calls += 1
+                            result, error_details = fetch_video_metadata(video_id, api_key)
+                            if result:
+                                cache.put_video(video_id, result)
+                    except requests.RequestException as e:
+                        # Reported per video below, like any other API error
+                        result, error_details = None, {'status_code': _response_status(e), 'message': str(e)}
+                    except Exception as e:
+                        api_errors += 1
+                        processing_errors += 1
+                        enriched_videos.append({
+                            'video_id': video_id,
+                            'added_at': added_at,
+                            'error': f"Processing error: {str(e)}",
+                            'appears_in_playlists': video_to_playlists[video_id],
+                        })
+                        continue  # Unexpected errors don't count toward aborting
                     if result:
                         api_success += 1
-                        consecutive_api_errors = 0
-                        result['_extracted_at'] = datetime.now(timezone.utc).isoformat()
-                        cache.put_video(video_id, result)
                         video_payload = result
-                    elif error_details:
+                    elif error_details and not _is_not_found_error(error_details):
                         api_errors += 1
-                        consecutive_api_errors += 1
-                        if error_details.get('error_code') == 'videoNotFound':
-                            videos_not_found += 1
-                        else:
-                            processing_errors += 1
+                        processing_errors += 1
+                        if first_use:
+                            abort_policy.record_failure(error_details.get('status_code'))
                         enriched_videos.append({
                             'video_id': video_id,
                             'added_at': added_at,
                             'error': error_details.get('message', 'Unknown error'),
-                            'appears_in_playlists': video_to_playlists.get(video_id, []),
+                            'appears_in_playlists': video_to_playlists[video_id],
                         })
                         continue
                     else:
+                        api_errors += 1
                         videos_not_found += 1
                         enriched_videos.append({
                             'video_id': video_id,
                             'added_at': added_at,
                             'error': 'Video not found',
-                            'appears_in_playlists': video_to_playlists.get(video_id, []),
+                            'appears_in_playlists': video_to_playlists[video_id],
                         })
                         continue
-                except requests.RequestException as e:
-                    api_errors += 1
-                    consecutive_api_errors += 1
-                    processing_errors += 1
-                    enriched_videos.append({
-                        'video_id': video_id,
-                        'added_at': added_at,
-                        'error': str(e),
-                        'appears_in_playlists': video_to_playlists.get(video_id, []),
-                    })
-                    continue
+                
+                # Build enriched video entry
+                output_video = _project_video(video_id, video_payload, added_at)
+                output_video['appears_in_playlists'] = video_to_playlists[video_id]
+                enriched_videos.append(output_video)
+                
+                # Stored only; tqdm redraws it on its own mininterval schedule
+                progress.set_postfix({
+                    'cached': video_cache_hits,
+                    'fetched': api_success,
+                    'errors': processing_errors,
+                }, refresh=False)
             
-            # Fetch channel data if not already cached
-            channel_id = video_payload.get('channel_id')
-            if channel_id and channel_id not in channels_by_id:
-                cached_channel = cache.get_channel(channel_id)
-                if cached_channel:
-                    channel_cache_hits += 1
-                    channels_by_id[channel_id] = cached_channel
-                else:
+            # Also true when the last video's failure reached the threshold
+            aborted = aborted or abort_policy.should_abort()
+            
+            # Channels are resolved once per unique ID after the video pass:
+            # cached ones with one bulk lookup, the rest with batched
+            # channels.list calls run on the same thread pool
+            if not aborted:
+                channel_ids = list(dict.fromkeys(
+                    video['channel_id'] for video in enriched_videos if video.get('channel_id')
+                ))
+                cached_channels = cache.get_channels(channel_ids)
+                channel_cache_hits = len(cached_channels)
+                
+                missing_ids = [cid for cid in channel_ids if cid not in cached_channels]
+                channel_batches = [
+                    missing_ids[start:start + VIDEOS_PER_REQUEST]
+                    for start in range(0, len(missing_ids), VIDEOS_PER_REQUEST)
+                ]
+                channel_futures = [
+                    executor.submit(fetch_channels_metadata, batch, api_key)
+                    for batch in channel_batches
+                ]
+                
+                fetched_channels: dict[str, dict] = {}
+                for batch, future in zip(channel_batches, channel_futures):
                     api_calls += 1
                     try:
-                        channel_data = fetch_channel_metadata(channel_id, api_key)
-                        if channel_data:
-                            api_success += 1
-                            channel_data['_extracted_at'] = datetime.now(timezone.utc).isoformat()
-                            cache.put_channel(channel_id, channel_data)
-                            channels_by_id[channel_id] = channel_data
-                    except requests.RequestException:
-                        api_errors += 1
-                        consecutive_api_errors += 1
-            
-            # Build enriched video entry
-            output_video = {
-                'video_id': video_id,
-                'title': video_payload.get('title'),
-                'description': video_payload.get('description'),
-                'thumbnail_url': video_payload.get('thumbnail_url'),
-                'channel_id': channel_id,
-                'privacy_status': video_payload.get('privacy_status'),
-                'statistics': video_payload.get('statistics'),
-                'topicDetails': video_payload.get('topicDetails'),
-                'video_data_extracted_at': video_payload.get('_extracted_at'),
-                'added_at': added_at,
-                'appears_in_playlists': video_to_playlists.get(video_id, []),
-            }
-            enriched_videos.append(output_video)
-            
-            progress.set_postfix({
-                'cached': video_cache_hits,
-                'fetched': api_success,
-                'errors': processing_errors,
-            })
-            
-            if consecutive_api_errors >= 10:
-                aborted = True
-                print("\nAborting: 10 consecutive API errors")
-                break
+                        batch_metadata = future.result()
+                    except requests.RequestException as e:
+                        api_errors += len(batch)
+                        processing_errors += len(batch)
+                        abort_policy.record_failure(_response_status(e))
+                        if abort_policy.should_abort():
+                            aborted = True
+                            break
+                        continue
+                    except Exception:
+                        api_errors += len(batch)
+                        processing_errors += len(batch)
+                        continue
+                    api_success += len(batch_metadata)
+                    fetched_channels.update(batch_metadata)
+                
+                if fetched_channels:
+                    cache.put_channels(fetched_channels.items())
+                
+                # Keep first-appearance order for the output
+                for channel_id in channel_ids:
+                    channel_data = cached_channels.get(channel_id) or fetched_channels.get(channel_id)
+                    if channel_data:
+                        channels_by_id[channel_id] = channel_data
+        finally:
+            # Drop look-ahead requests left over after an abort or error
+            executor.shutdown(wait=False, cancel_futures=True)
     
     if aborted:
+        progress.close()
+        print(f"\nAborting: {abort_policy.describe()}")
         return
     
     # Build channels output
-    channels_output = {}
-    for cid, channel_data in channels_by_id.items():
-        channels_output[cid] = {
-            'id': channel_data.get('id', cid),
-            'title': channel_data.get('title'),
-            'publishedAt': channel_data.get('publishedAt'),
-            'channel_data_extracted_at': channel_data.get('_extracted_at'),
-            'subscriber_count': channel_data.get('subscriber_count'),
-            'url': channel_data.get('url'),
-            'description': channel_data.get('description'),
-            'thumbnail_url': channel_data.get('thumbnail_url'),
-            'country': channel_data.get('country'),
-            'topicIds': channel_data.get('topicIds', []),
-            'topicCategories': channel_data.get('topicCategories', []),
-        }
+    channels_output = {
+        cid: _project_channel(cid, channel_data) for cid, channel_data in channels_by_id.items()
+    }
     
     # Build metadata
     metadata = {
@@ -1807,31 +2461,17 @@ def process_takeout_export(
     # Ensure parent directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Setup Jinja2 and render
-    if template_path:
-        template_dir = template_path.parent
-        template_name = template_path.name
-    else:
-        template_dir = Path(__file__).parent / 'templates'
-        template_name = 'playlist.html'
-    
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        autoescape=select_autoescape(['html', 'xml'])
-    )
-    env.filters['format_number'] = format_number
-    
-    template = env.get_template(template_name)
-    
-    html_content = template.render(
+    # Render
+    template = load_template(template_path)
+    stream = template.stream(
         title=title or 'YouTube Takeout Export',
         videos=enriched_videos,
         channels=channels_output,
         metadata=metadata,
     )
-    
+    stream.enable_buffering(size=_RENDER_BUFFER_SIZE)
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        stream.dump(f)
     
     # Export to SQLite if path provided
     if sqlite_path:
@@ -1840,7 +2480,7 @@ def process_takeout_export(
             enriched_videos=enriched_videos,
             channels_by_id=channels_by_id,
             playlist_info=playlist_full_info,
-            video_to_playlists=video_to_playlists,
+            video_to_playlist_ids=video_to_playlist_ids,
         )
     
     # Summary
@@ -1856,6 +2496,12 @@ def process_takeout_export(
         print(f"  SQLite: {sqlite_path}")
 
 
+def _sha256_file(path: Path) -> str:
+    """Return the hex SHA256 of a file, read and hashed by hashlib in C."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
 def compare_enriched_with_playlist(playlist_path: Path, enriched_path: Path, output_path: Path):
     """
     Compare enriched JSON output with original playlist CSV.
@@ -1868,36 +2514,34 @@ def compare_enriched_with_playlist(playlist_path: Path, enriched_path: Path, out
     # Get playlist file metadata
     playlist_stat = os.stat(playlist_path)
     playlist_size = playlist_stat.st_size
-    playlist_created_at = datetime.fromtimestamp(playlist_stat.st_birthtime, tz=timezone.utc).isoformat()
+    # st_birthtime is macOS/BSD only; elsewhere fall back to st_ctime
+    playlist_created_ts = getattr(playlist_stat, 'st_birthtime', playlist_stat.st_ctime)
+    playlist_created_at = datetime.fromtimestamp(playlist_created_ts, tz=timezone.utc).isoformat()
     playlist_modified_at = datetime.fromtimestamp(playlist_stat.st_mtime, tz=timezone.utc).isoformat()
     
-    # Calculate playlist checksum (SHA256)
-    sha256 = hashlib.sha256()
-    with open(playlist_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b''):
-            sha256.update(chunk)
-    playlist_checksum = sha256.hexdigest()
-    
-    # Parse playlist CSV
-    playlist_videos = parse_takeout_csv(playlist_path)
-    playlist_video_ids = {v['video_id'] for v in playlist_videos}
-    
-    # Load enriched JSON
-    with open(enriched_path, 'r', encoding='utf-8') as f:
-        enriched_data = json.load(f)
+    # Checksum the playlist (SHA256) on a worker thread while both inputs
+    # are parsed; hashing runs in C with the GIL released
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        checksum_future = executor.submit(_sha256_file, playlist_path)
+        
+        # Only the playlist's distinct video IDs are needed here
+        playlist_video_ids = set(iter_takeout_video_ids(playlist_path))
+        
+        # Load enriched JSON
+        enriched_data = read_json_file(enriched_path)
+        
+        playlist_checksum = checksum_future.result()
     
     enriched_videos = enriched_data.get('videos', [])
     enriched_video_ids = {v['video_id'] for v in enriched_videos if 'video_id' in v}
     
     # Analyze errors
-    errors_by_type: dict[str, list] = {}
+    errors_by_type: defaultdict[str, list] = defaultdict(list)
     videos_without_errors = 0
     for video in enriched_videos:
         if 'error' in video:
             video_id = video['video_id']
             error_msg = video['error']
-            if error_msg not in errors_by_type:
-                errors_by_type[error_msg] = []
             errors_by_type[error_msg].append({
                 'video_id': video_id,
                 'url': f'https://www.youtube.com/watch?v={video_id}',
@@ -1928,16 +2572,18 @@ def compare_enriched_with_playlist(playlist_path: Path, enriched_path: Path, out
         'errors_by_type': {},
     }
     
-    # Populate errors by type with all videos
+    # Populate errors by type with all videos, most frequent type first; each
+    # list is sorted in place rather than copied
+    by_video_id = itemgetter('video_id')
     for error_type, videos in sorted(errors_by_type.items(), key=lambda x: len(x[1]), reverse=True):
+        videos.sort(key=by_video_id)
         report['errors_by_type'][error_type] = {
             'count': len(videos),
-            'videos': sorted(videos, key=lambda v: v['video_id']),
+            'videos': videos,
         }
     
     # Write report to JSON
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    write_json_file(output_path, report)
     
     # Print summary to stdout
     print()
@@ -2030,7 +2676,7 @@ def main():
             input_path = validate_input_file(args.input)
             output_path = Path(args.output)
             sqlite_path = Path(args.sqlite_output) if args.sqlite_output else None
-            enrich_playlist(input_path, output_path, api_key, args.verbose, sqlite_path)
+            enrich_playlist(input_path, output_path, api_key, args.verbose, sqlite_path, args.compact)
         
         elif args.command == "config":
             if args.config_action == "set-api-key":